@@ -1,19 +1,47 @@
 import logging
+import sys
+import argparse
 import csv
 import random
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, WebDriverException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from time import sleep
+import queue
+import threading
+import contextvars
+import sqlite3
+import json
+import zlib
+import hashlib
+import io
+import socket
+from urllib.parse import urljoin, urlsplit
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import sleep, monotonic
 from random import uniform, choice
 from datetime import datetime
+from typing import Optional
 import os
+import shutil
+
+# Bound by load_selenium(); until a browser exists nothing can raise them, and
+# "except ()" catches nothing
+NoSuchElementException = WebDriverException = TimeoutException = ()
+
+def load_selenium():
+    """Import selenium and webdriver-manager, which take most of the module's start-up time, on first use"""
+    global webdriver, Options, Service, ChromeDriverManager, By, WebDriverWait, EC
+    global NoSuchElementException, WebDriverException, TimeoutException
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException, WebDriverException, TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
@@ -21,21 +49,1452 @@ USER_AGENTS = [
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/44.0.2403.157 Safari/537.36',
 ]
 
+# Collects title, company and detail URL of every result card in a single round trip
+HARVEST_CARDS_JS = """
+var cards = document.getElementsByClassName('srpResultCardContainer');
+var result = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    var title = card.querySelector('.jobTitle');
+    var company = card.querySelector('.companyName');
+    var link = card.querySelector('a[href*="job"]') || card.closest('a[href]') || card.querySelector('a[href]');
+    result.push({
+        index: i,
+        title: title ? title.innerText.trim() : '',
+        company: company ? company.innerText.trim() : '',
+        href: link ? link.href : null
+    });
+}
+return result;
+"""
+
+# Reads every field scrape_job_details needs from the details page in a single round trip
+EXTRACT_DETAILS_JS = """
+function text(el) { return el ? el.innerText.trim() : ''; }
+var na = 'Not available';
+var details = {
+    job_description: na, more_info: na, skills: na, about_company: na, salary: na,
+    role: na, industry: na, function: na, job_type: na
+};
+
+var desc = document.getElementById('jobDescription');
+if (desc) { details.job_description = text(desc); }
+
+var moreInfo = document.querySelector('.moreInfo');
+if (moreInfo) {
+    var parts = [];
+    var items = moreInfo.getElementsByTagName('p');
+    for (var i = 0; i < items.length; i++) {
+        var key = items[i].querySelector('.key');
+        var value = items[i].querySelector('.value');
+        if (!key || !value) { continue; }
+        var k = text(key).replace(/:/g, '');
+        var v = text(value);
+        parts.push(k + ':' + v);
+        if (k === 'Role') { details.role = v; }
+        else if (k === 'Industry') { details.industry = v; }
+        else if (k === 'Function') { details.function = v; }
+        else if (k === 'Job Type') { details.job_type = v; }
+    }
+    details.more_info = parts.join('\\n');
+}
+
+var skillsSection = document.getElementById('skillScoreSection');
+if (skillsSection) {
+    var skills = [];
+    var pills = skillsSection.querySelectorAll('.pillItem');
+    for (var j = 0; j < pills.length; j++) {
+        var skill = text(pills[j]);
+        if (skill) { skills.push(skill); }
+    }
+    if (pills.length) { details.skills = skills.join(', '); }
+}
+
+var company = document.getElementById('jobCompany');
+var companyDesc = company ? company.querySelector('.companyDesc') : null;
+if (companyDesc) { details.about_company = text(companyDesc); }
+
+var salary = document.evaluate("//span[contains(text(), 'INR') or contains(text(), 'LPA')]", document, null,
+                               XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (salary) { details.salary = text(salary); }
+
+return details;
+"""
+
+# URL patterns the lean profile blocks through CDP: images, media, fonts and analytics/ad hosts
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*hotjar.com*', '*clarity.ms*', '*moengage.com*', '*branch.io*', '*newrelic.com*',
+    '*nr-data.net*', '*taboola.com*', '*criteo.com*',
+]
+
+# Where the lean profile remembers the chromedriver path between runs
+CHROMEDRIVER_PATH_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'foundit', 'chromedriver_path')
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def resolve_chromedriver():
+    """Find a chromedriver binary without a network check, resolving it online only the very first time.
+
+    Looks at $CHROMEDRIVER_PATH, then the path cached by an earlier run, then chromedriver on
+    PATH; only if none exist does it fall back to webdriver-manager and cache what it returns.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+
+        candidates = [os.environ.get('CHROMEDRIVER_PATH')]
+        if os.path.exists(CHROMEDRIVER_PATH_CACHE):
+            with open(CHROMEDRIVER_PATH_CACHE, encoding='utf-8') as file:
+                candidates.append(file.read().strip())
+        candidates.append(shutil.which('chromedriver'))
+        for candidate in candidates:
+            if candidate and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                _chromedriver_path = candidate
+                return candidate
+
+        _chromedriver_path = ChromeDriverManager().install()
+        os.makedirs(os.path.dirname(CHROMEDRIVER_PATH_CACHE), exist_ok=True)
+        with open(CHROMEDRIVER_PATH_CACHE, 'w', encoding='utf-8') as file:
+            file.write(_chromedriver_path)
+        logging.info("Cached chromedriver path %s in %s", _chromedriver_path, CHROMEDRIVER_PATH_CACHE)
+        return _chromedriver_path
+
+# Any of these means a job details view (full page or popup) has rendered
+DETAIL_MARKERS = ('#srpJdContainerTop', '#jobDescription', '#skillScoreSection', '.moreInfo', '.jdTitle')
+# The one marker of the popup/modal view, which has only a title and a description
+POPUP_MARKER = '.jdTitle'
+RESULTS_MARKERS = ('.srpResultCardContainer',)
+
+# How long the DOM must go without mutations before a page counts as settled
+DOM_QUIET_MS = 500
+
+# Responses worth asking for again; fetch_html waits HTTP_RETRY_DELAY seconds, doubling each retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_RETRY_DELAY = 1.0
+
+# Returns the first marker present, 'quiet' once the DOM has settled, or null to keep polling
+PAGE_READY_JS = """
+var selectors = arguments[0], quietMs = arguments[1], restart = arguments[2];
+for (var i = 0; i < selectors.length; i++) {
+    if (document.querySelector(selectors[i])) { return selectors[i]; }
+}
+if (!window.__founditObserver) {
+    window.__founditLastMutation = Date.now();
+    window.__founditObserver = new MutationObserver(function () { window.__founditLastMutation = Date.now(); });
+    window.__founditObserver.observe(document, {childList: true, subtree: true, attributes: true});
+}
+if (restart) { window.__founditWaitStart = Date.now(); }
+var since = Math.max(window.__founditLastMutation, window.__founditWaitStart || 0);
+if (document.readyState === 'complete' && Date.now() - since > quietMs) { return 'quiet'; }
+return null;
+"""
+
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
 
+class RateLimiter:
+    """Thread-safe pacing that keeps every worker together under one requests-per-second budget"""
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self._next_slot = monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserve the next free slot and return how long to wait for it"""
+        if not self.interval:
+            return 0
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            sleep(delay)
+
+    async def wait_async(self):
+        import asyncio
+
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+CSV_HEADER = [
+    'Job Title', 
+    'Company Name',
+    'Salary',
+    'Job Link',
+    'Job Description',
+    'More Info',
+    'Skills Required',
+    'About Company'
+]
+
+@dataclass(frozen=True, slots=True)
+class JobRecord:
+    """One scraped job, in CSV_HEADER order, plus the query that found it"""
+    title: str
+    company: str
+    salary: str
+    link: str
+    description: str
+    more_info: str
+    skills: str
+    about_company: str
+    query_title: Optional[str] = None
+    query_location: Optional[str] = None
+    scraped_at: Optional[datetime] = None
+
+    def as_row(self):
+        return [self.title, self.company, self.salary, self.link, self.description, self.more_info, self.skills,
+                self.about_company]
+
+class Metrics:
+    """Thread-safe per-stage timing histograms and event counters.
+
+    Snapshots can be written as Prometheus text exposition (.prom / .txt) or JSON.
+    """
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time(self, stage):
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, monotonic() - start)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = {'buckets': [0] * len(self.BUCKETS), 'count': 0, 'sum': 0.0,
+                                                  'max': 0.0}
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            histogram['max'] = max(histogram['max'], seconds)
+
+    def increment(self, event, amount=1):
+        with self._lock:
+            self.counters[event] = self.counters.get(event, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+                'stages': {
+                    stage: {
+                        'count': h['count'],
+                        'sum_seconds': round(h['sum'], 4),
+                        'mean_seconds': round(h['sum'] / h['count'], 4) if h['count'] else 0.0,
+                        'max_seconds': round(h['max'], 4),
+                        'buckets': dict(zip([str(b) for b in self.BUCKETS], h['buckets']))
+                    } for stage, h in self.stages.items()
+                },
+                'counters': dict(self.counters)
+            }
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP foundit_stage_seconds Time spent in each scraping stage',
+            '# TYPE foundit_stage_seconds histogram'
+        ]
+        with self._lock:
+            for stage, h in sorted(self.stages.items()):
+                for bound, count in zip(self.BUCKETS, h['buckets']):
+                    lines.append(f'foundit_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'foundit_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h["count"]}')
+                lines.append(f'foundit_stage_seconds_sum{{stage="{stage}"}} {h["sum"]:.6f}')
+                lines.append(f'foundit_stage_seconds_count{{stage="{stage}"}} {h["count"]}')
+            lines.append('# HELP foundit_events_total Scraper events such as timeouts, fallbacks and duplicates')
+            lines.append('# TYPE foundit_events_total counter')
+            for event, count in sorted(self.counters.items()):
+                lines.append(f'foundit_events_total{{event="{event}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Atomically write a snapshot, as Prometheus text for .prom/.txt paths and JSON otherwise"""
+        if path.endswith(('.prom', '.txt')):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_file, path)
+
+class CsvSink:
+    """One open CSV handle fed through a queue and drained by a writer thread.
+
+    Rows are flushed every batch_size rows or flush_interval seconds, whichever
+    comes first, and checkpoint() / close() also fsync. With append=True an
+    existing file is continued instead of truncated. With shared=True several
+    processes can append to the same file: each flush writes whole rows under an
+    exclusive flock (POSIX only).
+    """
+    def __init__(self, path, header, append=False, batch_size=500, flush_interval=2.0, shared=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.shared = shared
+        self.rows_written = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or '.', exist_ok=True)
+        resuming = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, mode='a' if append else 'w', newline='', encoding='utf-8', buffering=1 << 20)
+        if shared:
+            # Rows collect here and reach the file only in locked, whole-row writes
+            self._buffer = io.StringIO()
+            self._writer = csv.writer(self._buffer)
+            with self._locked_file():
+                if os.fstat(self._file.fileno()).st_size == 0:
+                    csv.writer(self._file).writerow(header)
+        else:
+            self._writer = csv.writer(self._file)
+            if not resuming:
+                self._writer.writerow(header)
+
+        # Bounded so a stalled disk applies backpressure instead of growing memory
+        self._queue = queue.Queue(maxsize=batch_size * 20)
+        self._thread = threading.Thread(target=self._run, name='csv-sink', daemon=True)
+        self._thread.start()
+
+    def write(self, row):
+        self._queue.put(row)
+
+    def checkpoint(self):
+        """Block until everything queued so far is flushed and fsynced"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if not self._file.closed:
+            self._file.close()
+
+    @contextmanager
+    def _locked_file(self):
+        import fcntl
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+            self._file.flush()
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _flush(self, fsync=False):
+        if self.shared:
+            rows = self._buffer.getvalue()
+            if rows:
+                with self._locked_file():
+                    self._file.write(rows)
+                self._buffer.seek(0)
+                self._buffer.truncate()
+        else:
+            self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def _run(self):
+        pending = 0
+        last_flush = monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, self.flush_interval - (monotonic() - last_flush)))
+            except queue.Empty:
+                item = ()
+
+            try:
+                if item is None:
+                    self._flush(fsync=True)
+                    return
+                if isinstance(item, threading.Event):
+                    self._flush(fsync=True)
+                    item.set()
+                    pending = 0
+                    last_flush = monotonic()
+                    continue
+                if item:
+                    self._writer.writerow(item)
+                    self.rows_written += 1
+                    pending += 1
+                if pending and (pending >= self.batch_size or monotonic() - last_flush >= self.flush_interval):
+                    self._flush()
+                    pending = 0
+                    last_flush = monotonic()
+                elif not pending:
+                    last_flush = monotonic()
+            except Exception as e:
+                logging.error(f"CSV writer failed on {self.path}: {e}")
+                if isinstance(item, threading.Event):
+                    item.set()
+
+# (title, location) of the query being scraped, for outputs that record it; set per
+# thread and per asyncio task
+CURRENT_QUERY = contextvars.ContextVar('current_query', default=(None, None))
+# When the detail cache last missed in this thread or asyncio task, to time the page load that followed
+CACHE_MISS_STARTED = contextvars.ContextVar('cache_miss_started', default=None)
+
+def pid_alive(pid):
+    """Whether a process with this pid is running on this host"""
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+    if os.name == 'nt':
+        # os.kill would terminate it there, so assume it is
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class ParquetSink:
+    """Scraped records as a zstd-compressed Parquet dataset, partitioned by run date and query location.
+
+    Files land in <path>/run_date=YYYY-MM-DD/query_location=<location>/ with the
+    CSV_HEADER columns plus Scraped At and Query Title, about batch_rows rows each.
+    checkpoint() makes the rows since the last file durable in an Arrow stream under
+    <path>/_staging/ rather than writing a small Parquet file every page; they are
+    written out with the next full batch or at close(). Staging files a crashed run
+    left on this host are turned into Parquet when the next run opens the dataset.
+    Read it back with pyarrow.dataset.dataset(path, partitioning='hive'), which
+    skips _staging.
+    """
+    def __init__(self, path, batch_rows=10000):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("The Parquet dataset output needs pyarrow: pip install pyarrow")
+        self.path = path
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        started = datetime.now()
+        self.run_date = started.date().isoformat()
+        # Files of concurrent or later runs never collide
+        self.run_id = f"{started.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.schema = pa.schema([(name, pa.string()) for name in CSV_HEADER] + [
+            ('Scraped At', pa.timestamp('s')),
+            ('Query Title', pa.string()),
+            ('run_date', pa.string()),
+            ('query_location', pa.string()),
+        ])
+        self._rows = []
+        # Batches checkpointed to the staging stream but not yet written as Parquet
+        self._staged = []
+        self._staged_rows = 0
+        self._stream_file = None
+        self._stream = None
+        self._files = 0
+        self._lock = threading.Lock()
+        # One directory per host, since the pid in a staging file's name is only meaningful there
+        self.staging_dir = os.path.join(path, '_staging', socket.gethostname())
+        self.staging_file = os.path.join(self.staging_dir, f"{self.run_id}.arrows")
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self.recover_staging()
+
+    def recover_staging(self):
+        """Write out the staged rows of runs on this host that died before close()"""
+        import pyarrow as pa
+
+        for name in sorted(os.listdir(self.staging_dir)):
+            run_id = name[:-len('.arrows')]
+            if not name.endswith('.arrows') or pid_alive(int(run_id.rsplit('-', 1)[1])):
+                continue
+            staging_file = os.path.join(self.staging_dir, name)
+            batches = []
+            try:
+                with pa.ipc.open_stream(staging_file) as reader:
+                    for batch in reader:
+                        batches.append(batch)
+            except (pa.ArrowInvalid, OSError):
+                # The crash cut the last batch short; the complete ones before it are kept
+                pass
+            if batches:
+                self._write_parquet(pa.Table.from_batches(batches), f"part-{run_id}-recovered-{{i}}.parquet")
+                logging.info("Recovered %d staged dataset rows of run %s", sum(len(b) for b in batches), run_id)
+            os.remove(staging_file)
+
+    def write(self, row, query_title=None, query_location=None):
+        with self._lock:
+            self._rows.append(list(row) + [datetime.now().replace(microsecond=0), query_title,
+                                           self.run_date, query_location])
+            if self._staged_rows + len(self._rows) >= self.batch_rows:
+                self._flush()
+
+    def checkpoint(self):
+        with self._lock:
+            if self._rows:
+                self._stage()
+
+    def close(self):
+        with self._lock:
+            if self._rows or self._staged:
+                self._flush()
+
+    def _batch(self):
+        import pyarrow as pa
+
+        return pa.RecordBatch.from_pylist([dict(zip(self.schema.names, row)) for row in self._rows],
+                                          schema=self.schema)
+
+    def _stage(self):
+        import pyarrow as pa
+
+        batch = self._batch()
+        if self._stream is None:
+            self._stream_file = open(self.staging_file, 'wb')
+            self._stream = pa.ipc.new_stream(self._stream_file, self.schema)
+        self._stream.write_batch(batch)
+        self._stream_file.flush()
+        os.fsync(self._stream_file.fileno())
+        self._staged.append(batch)
+        self._staged_rows += len(batch)
+        self._rows = []
+
+    def _flush(self):
+        import pyarrow as pa
+
+        batches = self._staged + ([self._batch()] if self._rows else [])
+        table = pa.Table.from_batches(batches, schema=self.schema)
+        self._write_parquet(table, f"part-{self.run_id}-{self._files}-{{i}}.parquet")
+        self._files += 1
+        self.rows_written += len(table)
+        self._rows = []
+        self._staged = []
+        self._staged_rows = 0
+        if self._stream is not None:
+            # Its rows are in Parquet now
+            self._stream.close()
+            self._stream_file.close()
+            self._stream = None
+            os.remove(self.staging_file)
+
+    def _write_parquet(self, table, basename_template):
+        import pyarrow.dataset as ds
+
+        ds.write_dataset(
+            table, self.path, format='parquet',
+            partitioning=['run_date', 'query_location'], partitioning_flavor='hive',
+            basename_template=basename_template,
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression='zstd')
+        )
+
+def parse_job_id(url):
+    """Foundit's numeric job ID from a detail URL, e.g. /job/full-stack-developer-acme-pune-34567890"""
+    if not url:
+        return None
+    match = re.search(r'(\d{5,})/?$', urlsplit(url).path) or re.search(r'[?&]jobId=(\d+)', url)
+    return match.group(1) if match else None
+
+def job_dedup_key(job_title_text, company_name, job_link=None):
+    """Dedup key for a posting: its job ID when the link has one, otherwise title and company"""
+    job_id = parse_job_id(job_link)
+    return f"id:{job_id}" if job_id else f"{job_title_text}_{company_name}"
+
+class JobIndex:
+    """Persistent SQLite index of every job key ever scraped, with first/last seen timestamps.
+
+    Lookups are primary-key B-tree probes and memory is bounded by SQLite's page
+    cache, so the index can hold millions of keys across runs. A shared index
+    (several nodes on one volume) uses a rollback journal like TaskQueue, since
+    WAL needs shared memory between the processes.
+    """
+    def __init__(self, path, shared=False):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        # journal_mode is stored in the file, so a shared index also undoes an earlier WAL run
+        self._conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_key TEXT PRIMARY KEY, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL) WITHOUT ROWID"
+        )
+        # Jobs some process is extracting right now, so that processes sharing the index skip them
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims ("
+            "job_key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+
+    def seen(self, job_key):
+        """True if the key was scraped before, bumping its last_seen timestamp"""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE jobs SET last_seen = ? WHERE job_key = ?",
+                                        (datetime.now().isoformat(timespec='seconds'), job_key))
+            return cursor.rowcount > 0
+
+    def add(self, job_key):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_key, first_seen, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(job_key) DO UPDATE SET last_seen = excluded.last_seen",
+                (job_key, now, now)
+            )
+
+    def claim(self, job_key, owner, ttl_seconds=600):
+        """Reserve an unscraped key for owner; False if it is scraped or claimed by another owner.
+
+        Claims of a process that died without releasing them expire after ttl_seconds.
+        """
+        now = datetime.now().timestamp()
+        with self._lock:
+            self._conn.execute("DELETE FROM claims WHERE job_key = ? AND expires < ?", (job_key, now))
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO claims (job_key, owner, expires) "
+                "SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE job_key = ?)",
+                (job_key, owner, now + ttl_seconds, job_key)
+            )
+            return cursor.rowcount > 0
+
+    def release(self, job_key, owner):
+        with self._lock:
+            self._conn.execute("DELETE FROM claims WHERE job_key = ? AND owner = ?", (job_key, owner))
+
+    def release_owner(self, owner):
+        """Drop every claim held by owner, e.g. a worker whose lease ran out"""
+        with self._lock:
+            self._conn.execute("DELETE FROM claims WHERE owner = ?", (owner,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class TaskQueue:
+    """Shared SQLite queue of (title, location, page) tasks for any number of worker processes.
+
+    lease() hands a pending task to one worker for lease_seconds, and heartbeat()
+    extends it. Leases that run out (a crashed or stalled worker) go back to
+    pending on the next lease(), and a task leased max_attempts times without
+    finishing is marked failed; a re-leased task reports the worker that held it
+    before as previous_worker. Finishing a page queues the next one. The file can
+    live on a shared volume: it uses a rollback journal, not WAL, which needs shared
+    memory between the processes.
+    """
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "title TEXT NOT NULL, location TEXT NOT NULL, page INTEGER NOT NULL, start INTEGER NOT NULL, "
+            "saved INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL DEFAULT 'pending', worker TEXT, "
+            "lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (title, location, page))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status)")
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two workers never lease the same task
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def put(self, title, location, page=1, start=0, saved=0):
+        """Queue a task unless it is already queued, running or finished"""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO tasks (title, location, page, start, saved) VALUES (?, ?, ?, ?, ?)",
+                         (title, location, page, start, saved))
+
+    def lease(self, worker, lease_seconds=300):
+        """Lease the next pending task to worker, or return None if none is pending"""
+        now = datetime.now().timestamp()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE status = 'leased' AND lease_expires < ?", (self.max_attempts, now)
+            )
+            row = conn.execute(
+                "SELECT title, location, page, start, saved, attempts, worker FROM tasks WHERE status = 'pending' "
+                "ORDER BY attempts, rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE title = ? AND location = ? AND page = ?", (worker, now + lease_seconds) + row[:3]
+            )
+        return dict(zip(('title', 'location', 'page', 'start', 'saved', 'attempts', 'previous_worker'), row))
+
+    def heartbeat(self, task, worker, lease_seconds=300):
+        """Extend a lease; False if the worker no longer holds it"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE title = ? AND location = ? AND page = ? "
+                "AND status = 'leased' AND worker = ?",
+                (datetime.now().timestamp() + lease_seconds, task['title'], task['location'], task['page'], worker)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task, worker, next_task=None):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'done', worker = NULL WHERE title = ? AND location = ? AND page = ? "
+                "AND worker = ?", (task['title'], task['location'], task['page'], worker)
+            )
+            if next_task is not None:
+                conn.execute(
+                    "INSERT OR IGNORE INTO tasks (title, location, page, start, saved) VALUES (?, ?, ?, ?, ?)",
+                    (next_task['title'], next_task['location'], next_task['page'], next_task['start'],
+                     next_task['saved'])
+                )
+
+    def fail(self, task, worker):
+        """Give a task back, or mark it failed once it has used up its attempts"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE title = ? AND location = ? AND page = ? AND worker = ?",
+                (self.max_attempts, task['title'], task['location'], task['page'], worker)
+            )
+
+    def requeue(self, task, worker):
+        """Give back a task that was interrupted rather than failed, without using up an attempt"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'pending', attempts = attempts - 1 "
+                "WHERE title = ? AND location = ? AND page = ? AND worker = ?",
+                (task['title'], task['location'], task['page'], worker)
+            )
+
+    def counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def canonical_job_url(url):
+    """Detail URL without query string, fragment or trailing slash, so that one posting has one cache key"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+class DetailCache:
+    """On-disk cache of extracted job details, keyed on a hash of the canonical detail URL.
+
+    Entries older than ttl_seconds count as misses and are replaced when the page
+    is extracted again. Once the stored size passes max_bytes the least recently
+    used entries are evicted. With store_html=True a zlib-compressed copy of the
+    raw page is kept alongside the details.
+    """
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_bytes=512 * 1024 * 1024, store_html=False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.store_html = store_html
+        self.hits = 0
+        self.misses = 0
+        # Time the original page loads and extractions took, summed over this run's hits
+        self.saved_seconds = 0.0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, details TEXT NOT NULL, html BLOB, "
+            "size INTEGER NOT NULL, fetch_seconds REAL NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL) "
+            "WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        self._lock = threading.Lock()
+
+    def key(self, url):
+        return hashlib.sha256(canonical_job_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        """Cached details dict for the URL, or None on a miss or an expired entry"""
+        key = self.key(url)
+        now = datetime.now().timestamp()
+        with self._lock:
+            row = self._conn.execute("SELECT details, created_at, fetch_seconds FROM pages WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            self.saved_seconds += row[2]
+        return json.loads(row[0])
+
+    def put(self, url, details, html=None, fetch_seconds=0.0):
+        """Store details, with how long loading and extracting the page took"""
+        key = self.key(url)
+        now = datetime.now().timestamp()
+        payload = json.dumps(details)
+        blob = zlib.compress(html.encode('utf-8')) if html and self.store_html else None
+        size = len(payload) + (len(blob) if blob else 0)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, details, html, size, fetch_seconds, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, canonical_job_url(url), payload, blob, size, fetch_seconds, now, now)
+            )
+            self._size += size - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache is back under 90% of its budget
+        target = self.max_bytes * 0.9
+        while self._size > target:
+            rows = self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at LIMIT 100").fetchall()
+            if not rows:
+                self._size = 0
+                return
+            evicted = []
+            for key, size in rows:
+                if self._size <= target:
+                    break
+                evicted.append((key,))
+                self._size -= size
+            self._conn.executemany("DELETE FROM pages WHERE key = ?", evicted)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (f"Detail cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                f"~{self.saved_seconds:.1f}s of page loads saved")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class NearDuplicateIndex:
+    """MinHash signatures in an LSH index, clustering reposts by description and skills.
+
+    Word shingles are hashed once each and binned into num_perm minimums (one
+    permutation hashing), so a signature costs one crc32 per shingle. Signatures
+    are split into bands; records sharing any band bucket are compared and joined
+    to the earlier record's cluster when their estimated Jaccard similarity reaches
+    threshold. Only the first record of each cluster is stored, as a fixed-size
+    signature plus one bucket entry per band.
+    """
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.records = 0
+        self.duplicates = 0
+        self._tables = [{} for _ in range(bands)]
+        self._signatures = array('Q')
+        self._labels = []
+        self._lock = threading.Lock()
+
+    def shingles(self, text):
+        words = re.findall(r'[a-z0-9+#]+', text.lower())
+        size = self.shingle_size
+        if len(words) <= size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+    def signature(self, text):
+        """MinHash signature of the text, or None if it has no words"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        num_perm = self.num_perm
+        empty = 1 << 32
+        bins = [empty] * num_perm
+        for shingle in shingles:
+            # Spread crc32's bits over 64 so the bin and the value are independent
+            value = (zlib.crc32(shingle.encode()) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+            index = (value >> 32) % num_perm
+            value &= 0xFFFFFFFF
+            if value < bins[index]:
+                bins[index] = value
+        # Short texts leave bins empty; each borrows the next filled bin, offset by the distance
+        for index in range(num_perm):
+            if bins[index] == empty:
+                for step in range(1, num_perm):
+                    borrowed = bins[(index + step) % num_perm]
+                    if borrowed < empty:
+                        bins[index] = borrowed + step * empty
+                        break
+        return bins
+
+    def similarity(self, signature, representative):
+        start = representative * self.num_perm
+        stored = self._signatures[start:start + self.num_perm]
+        return sum(a == b for a, b in zip(signature, stored)) / self.num_perm
+
+    def add(self, label, text):
+        """Index a record and return the label of the earlier record it nearly duplicates, or None"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        rows = self.rows
+        keys = [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+        with self._lock:
+            self.records += 1
+            checked = set()
+            for table, key in zip(self._tables, keys):
+                representative = table.get(key)
+                if representative is None or representative in checked:
+                    continue
+                checked.add(representative)
+                if self.similarity(signature, representative) >= self.threshold:
+                    self.duplicates += 1
+                    return self._labels[representative]
+            representative = len(self._labels)
+            self._labels.append(label)
+            self._signatures.extend(signature)
+            for table, key in zip(self._tables, keys):
+                table.setdefault(key, representative)
+        return None
+
+    def add_record(self, record):
+        """add() for a CSV_HEADER row, keyed on its job link"""
+        text = ' '.join(value for value in (record[4], record[6]) if value != "Not available")
+        return self.add(record[3], text)
+
+    def load_csv(self, path):
+        """Index the rows of an existing output file, e.g. before appending to it"""
+        # Descriptions can be longer than the csv module's default field limit
+        csv.field_size_limit(2 ** 31 - 1)
+        with open(path, newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for record in reader:
+                if len(record) >= len(CSV_HEADER):
+                    self.add_record(record)
+
+    def summary(self):
+        return (f"Near-duplicate check: {self.duplicates} of {self.records} records matched an earlier posting, "
+                f"{len(self._labels)} clusters")
+
+def dedup_csv(input_path, output_path, threshold=0.8, duplicates_path=None):
+    """Copy a scraped CSV without its near-duplicate postings, streaming one row at a time.
+
+    With duplicates_path, each dropped row's job link is written there next to the
+    link of the posting it duplicates. Returns (rows read, rows dropped).
+    """
+    # Descriptions can be longer than the csv module's default field limit
+    csv.field_size_limit(2 ** 31 - 1)
+    index = NearDuplicateIndex(threshold)
+    rows = 0
+    pairs = open(duplicates_path, 'w', newline='', encoding='utf-8') if duplicates_path else None
+    try:
+        if pairs is not None:
+            pairs_writer = csv.writer(pairs)
+            pairs_writer.writerow(['Job Link', 'Duplicate Of'])
+        with open(input_path, newline='', encoding='utf-8') as source, \
+                open(output_path, 'w', newline='', encoding='utf-8') as target:
+            reader = csv.reader(source)
+            writer = csv.writer(target)
+            writer.writerow(next(reader, CSV_HEADER))
+            for record in reader:
+                rows += 1
+                original = index.add_record(record) if len(record) >= len(CSV_HEADER) else None
+                if original is None:
+                    writer.writerow(record)
+                elif pairs is not None:
+                    pairs_writer.writerow([record[3], original])
+    finally:
+        if pairs is not None:
+            pairs.close()
+    logging.info(index.summary())
+    return rows, index.duplicates
+
+SALARY_AMOUNT = r'\d[\d,]*(?:\.\d+)?'
+SALARY_UNIT = r'(?:lpa|lakhs?|lacs?|l|crores?|cr|k)\b'
+# Salary text such as "INR 8 - 14 LPA", "₹ 5,00,000 - 8,00,000 per annum", "$ 50k - 70k" or "8L - 14L".
+# A figure needs a currency before it or a unit after it, so an experience range like "2-5 Yrs" is
+# skipped. RE2 has no lookahead, so each alternative names its groups apart and normalize_batch merges them.
+SALARY_PATTERN = (
+    rf'(?i)(?P<currency>\b(?:inr|usd|eur|gbp|rs)\b\.?|₹|\$)\s*(?P<min>{SALARY_AMOUNT})\s*(?P<min_unit>{SALARY_UNIT})?'
+    rf'(?:\s*(?:-|to)\s*(?P<max>{SALARY_AMOUNT})\s*(?P<unit>{SALARY_UNIT})?)?'
+    rf'|(?P<range_min>{SALARY_AMOUNT})\s*(?P<range_min_unit>{SALARY_UNIT})?\s*(?:-|to)\s*'
+    rf'(?P<range_max>{SALARY_AMOUNT})\s*(?P<range_unit>{SALARY_UNIT})'
+    rf'|(?P<single>{SALARY_AMOUNT})\s*(?P<single_unit>{SALARY_UNIT})'
+)
+# Salary Period is the first of these that matches; lakh and crore figures default to yearly
+SALARY_PERIODS = [
+    ('hour', r'(?i)hour|/\s*hr\b'),
+    ('month', r'(?i)month|p\.?\s?m\b'),
+    ('year', r'(?i)lpa|annum|annual|year|yr\b|p\.?\s?a\b|lakh|lac|crore|\bcr\b|\d\s*l\b'),
+]
+SALARY_UNITS = [
+    (100000, r'(?i)^(lpa|lakhs?|lacs?|l)$'),
+    (10000000, r'(?i)^(crores?|cr)$'),
+    (1000, r'(?i)^k$'),
+]
+# The More Info keys scrape_job_details recognizes, each becoming a column
+MORE_INFO_KEYS = ['Role', 'Industry', 'Function', 'Job Type']
+
+def normalize_batch(batch):
+    """Add typed Salary, More Info and Skills columns to a pyarrow RecordBatch of CSV_HEADER rows"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    def blank_to_null(values, missing=''):
+        return pc.if_else(pc.equal(values, missing), pa.scalar(None, values.type), values)
+
+    def first_match(values, choices, value_type):
+        conditions = [pc.fill_null(pc.match_substring_regex(values, pattern), False) for _, pattern in choices]
+        return pc.case_when(pc.make_struct(*conditions, field_names=[str(i) for i in range(len(choices))]),
+                            *[pa.scalar(value, value_type) for value, _ in choices])
+
+    columns = dict(zip(batch.schema.names, batch.columns))
+
+    salary = blank_to_null(columns['Salary'], "Not available")
+    parts = pc.extract_regex(salary, SALARY_PATTERN)
+
+    def group(*names):
+        # Only the alternative that matched has non-empty groups
+        return pc.coalesce(*[blank_to_null(pc.struct_field(parts, name)) for name in names])
+
+    def amount(*names):
+        return pc.cast(pc.replace_substring(group(*names), ',', ''), pa.float64())
+
+    def multiplier(unit):
+        return pc.fill_null(first_match(unit, SALARY_UNITS, pa.float64()), 1.0)
+
+    # A bound without a unit of its own takes the other's, as in "8 - 14 LPA"
+    min_unit = group('min_unit', 'range_min_unit', 'single_unit')
+    max_unit = group('unit', 'range_unit')
+    low_multiplier = multiplier(pc.coalesce(min_unit, max_unit))
+    low = pc.multiply(amount('min', 'range_min', 'single'), low_multiplier)
+    high = pc.multiply(amount('max', 'range_max'), multiplier(pc.coalesce(max_unit, min_unit)))
+    high = pc.coalesce(high, low)
+    currency = pc.utf8_upper(group('currency'))
+    currency = pc.replace_substring_regex(currency, r'^(₹|RS\.?)$', 'INR')
+    currency = pc.replace_substring(currency, '$', 'USD')
+    # Lakh and crore amounts are rupees even when the currency is left out; 'k' ones could be anything
+    rupee_unit = pc.or_(pc.equal(low_multiplier, 100000.0), pc.equal(low_multiplier, 10000000.0))
+    currency = pc.if_else(pc.and_(pc.is_null(currency), rupee_unit), 'INR', currency)
+    period = pc.if_else(pc.is_valid(low), first_match(salary, SALARY_PERIODS, pa.string()),
+                        pa.scalar(None, pa.string()))
+
+    names = list(batch.schema.names) + ['Salary Min', 'Salary Max', 'Salary Currency', 'Salary Period']
+    arrays = list(batch.columns) + [low, high, currency, period]
+
+    more_info = columns['More Info']
+    for key in MORE_INFO_KEYS:
+        value = pc.struct_field(pc.extract_regex(more_info, rf'(?m)^{key}:(?P<value>.*)$'), 'value')
+        names.append(key)
+        arrays.append(blank_to_null(pc.utf8_trim_whitespace(value)))
+
+    skills = blank_to_null(blank_to_null(pc.utf8_trim_whitespace(columns['Skills Required'])), "Not available")
+    skills = pc.split_pattern_regex(pc.utf8_lower(skills), r'\s*,\s*')
+    names.append('Skills')
+    arrays.append(skills)
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+def normalize_csv(input_path, output_path, chunk_mb=16):
+    """Write a scraped CSV with typed salary, More Info and skills columns, one block at a time.
+
+    Salary becomes Salary Min/Salary Max (in currency units, so LPA figures are
+    multiplied out), Salary Currency and Salary Period; More Info is split into
+    Role, Industry, Function and Job Type; Skills is a lowercased list. All parsing
+    runs in Arrow's vectorized regex kernels and only chunk_mb of input is held at
+    once. Writes Parquet for a .parquet output path and CSV otherwise (with the
+    skills joined by ", "). Returns the number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        raise ImportError("normalize_csv needs pyarrow: pip install pyarrow")
+
+    reader = pa_csv.open_csv(
+        input_path,
+        read_options=pa_csv.ReadOptions(block_size=chunk_mb * 1024 * 1024),
+        # Descriptions span several lines, and every column stays text until normalized
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in CSV_HEADER},
+                                              strings_can_be_null=False)
+    )
+    parquet = output_path.endswith('.parquet')
+    writer = None
+    rows = 0
+    try:
+        for batch in reader:
+            batch = normalize_batch(batch)
+            if not parquet:
+                skills = batch.column(batch.schema.get_field_index('Skills'))
+                batch = batch.set_column(batch.schema.get_field_index('Skills'), 'Skills',
+                                         pc.binary_join(skills, ', '))
+            if writer is None:
+                if parquet:
+                    import pyarrow.parquet as pq
+                    writer = pq.ParquetWriter(output_path, batch.schema)
+                else:
+                    writer = pa_csv.CSVWriter(output_path, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    logging.info("Normalized %d rows into '%s'", rows, output_path)
+    return rows
+
+def parse_job_details(html):
+    """Parse raw details page HTML into the scrape_job_details dict, or None if it needs JS to render"""
+    import lxml.html
+
+    doc = lxml.html.fromstring(html)
+    if not (doc.xpath("//*[@id='srpJdContainerTop' or @id='jobDescription' or @id='skillScoreSection']")
+            or doc.find_class('moreInfo')):
+        return None
+
+    def text(elements):
+        return elements[0].text_content().strip() if elements else None
+
+    details = {
+        'job_description': text(doc.xpath("//*[@id='jobDescription']")) or "Not available",
+        'more_info': "Not available",
+        'skills': "Not available",
+        'about_company': text(doc.xpath("//*[@id='jobCompany']//*[contains(concat(' ', normalize-space(@class), ' '), ' companyDesc ')]")) or "Not available",
+        'salary': text(doc.xpath("//span[contains(text(), 'INR') or contains(text(), 'LPA')]")) or "Not available"
+    }
+
+    more_info = doc.find_class('moreInfo')
+    if more_info:
+        parts = []
+        for item in more_info[0].iter('p'):
+            key = item.find_class('key')
+            value = item.find_class('value')
+            if key and value:
+                parts.append(f"{key[0].text_content().strip().replace(':', '')}:{value[0].text_content().strip()}")
+        details['more_info'] = "\n".join(parts)
+
+    skills_section = doc.xpath("//*[@id='skillScoreSection']")
+    if skills_section:
+        pills = skills_section[0].find_class('pillItem')
+        if pills:
+            details['skills'] = ", ".join(p.text_content().strip() for p in pills if p.text_content().strip())
+
+    return details
+
+class HtmlArchive:
+    """Append-only archive of raw detail pages, kept for offline re-extraction.
+
+    Pages are zlib-compressed and appended to segment files that roll over at
+    segment_mb; an index.db next to them records each page's URL, card title and
+    company, segment, offset and length. Every process writes segments of its own,
+    so several scrapers can archive into one directory.
+    """
+    def __init__(self, path, segment_mb=256):
+        self.path = path
+        self.segment_bytes = segment_mb * 1024 * 1024
+        self.pages_written = 0
+        self.bytes_written = 0
+        self._prefix = f"segment-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._segment_number = 0
+        self._segment = None
+        self._segment_name = None
+
+        os.makedirs(path, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(path, 'index.db'), timeout=60, check_same_thread=False,
+                                     isolation_level=None)
+        # Several writers may share the directory over a network volume, where WAL is unsafe
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL, title TEXT, company TEXT, archived_at TEXT NOT NULL, "
+            "segment TEXT NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url)")
+        self._lock = threading.Lock()
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        self._segment_number += 1
+        self._segment_name = f"{self._prefix}-{self._segment_number:04d}.z"
+        self._segment = open(os.path.join(self.path, self._segment_name), 'ab')
+
+    def add(self, url, html, title=None, company=None):
+        blob = zlib.compress(html.encode('utf-8'))
+        with self._lock:
+            if self._segment is None or (self._segment.tell() and
+                                         self._segment.tell() + len(blob) > self.segment_bytes):
+                self._open_segment()
+            offset = self._segment.tell()
+            self._segment.write(blob)
+            # The index must never point past what is in the file
+            self._segment.flush()
+            self._conn.execute(
+                "INSERT INTO pages (url, title, company, archived_at, segment, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, title, company, datetime.now().isoformat(timespec='seconds'), self._segment_name, offset,
+                 len(blob))
+            )
+            self.pages_written += 1
+            self.bytes_written += len(blob)
+
+    def close(self):
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+            self._conn.close()
+
+def reextract_segment(archive_dir, segment, entries):
+    """Parse one segment's archived pages into CSV_HEADER records; runs in a reextract worker process"""
+    records = []
+    failed = 0
+    with open(os.path.join(archive_dir, segment), 'rb') as file:
+        for url, title, company, offset, length in entries:
+            try:
+                file.seek(offset)
+                details = parse_job_details(zlib.decompress(file.read(length)).decode('utf-8'))
+            except Exception:
+                details = None
+            if details is None:
+                failed += 1
+                continue
+            records.append([title, company, details['salary'], url, details['job_description'],
+                            details['more_info'], details['skills'], details['about_company']])
+    return records, failed
+
+def reextract(archive_dir, output_file, processes=None, batch_size=500):
+    """Re-run detail extraction over an HtmlArchive with a process pool and lxml, no browser.
+
+    Only the newest copy of each URL is used. Pages are handed out in batches of
+    batch_size from one segment, read in file order by the worker itself. Writes a
+    CSV in the scraper's format and returns (pages read, records written).
+    """
+    conn = sqlite3.connect(os.path.join(archive_dir, 'index.db'))
+    try:
+        rows = conn.execute(
+            "SELECT segment, url, title, company, offset, length FROM pages "
+            "WHERE id IN (SELECT MAX(id) FROM pages GROUP BY url) ORDER BY segment, offset"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    batches = []
+    for row in rows:
+        if not batches or batches[-1][0] != row[0] or len(batches[-1][1]) >= batch_size:
+            batches.append((row[0], []))
+        batches[-1][1].append(row[1:])
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    written = 0
+    failed = 0
+    # Enough batches in flight to keep every worker busy, few enough to bound memory
+    window = (processes or os.cpu_count() or 1) * 4
+    with open(output_file, 'w', newline='', encoding='utf-8') as file, \
+            ProcessPoolExecutor(max_workers=processes) as pool:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        pending = deque()
+        for position in range(len(batches) + window):
+            if position < len(batches):
+                segment, entries = batches[position]
+                pending.append(pool.submit(reextract_segment, archive_dir, segment, entries))
+            if pending and (len(pending) >= window or position >= len(batches)):
+                records, batch_failed = pending.popleft().result()
+                writer.writerows(records)
+                written += len(records)
+                failed += batch_failed
+    logging.info("Re-extracted %d of %d archived pages into '%s' (%d could not be parsed)",
+                 written, len(rows), output_file, failed)
+    return len(rows), written
+
 class FounditJob:
-    def __init__(self, job_titles, job_locations, output_file='foundit.csv'):
+    def __init__(self, job_titles, job_locations, output_file='foundit.csv', workers=1, requests_per_second=0.5,
+                 direct_links=False, max_pages=None, max_jobs=None, js_extraction=True, ready_timeout=5,
+                 backend='selenium', http_concurrency=8, http_retries=3, base_url='https://www.foundit.in',
+                 append=False, flush_rows=500, flush_seconds=2.0, index_file=None, checkpoint_file=None,
+                 resume=False, cache_file=None, cache_ttl=7 * 24 * 3600, cache_max_mb=512, cache_html=False,
+                 headless=None, metrics_file=None, metrics_interval=30, profile='default',
+                 recycle_pages=300, max_browser_mb=1500, max_session_restarts=3, near_duplicate_threshold=None,
+                 dataset_dir=None, dataset_rows=10000, queue_file=None, lease_seconds=300, queue_poll_seconds=5,
+                 archive_dir=None, archive_segment_mb=256, stream_buffer=100):
         self.job_titles = job_titles
         self.job_locations = job_locations
         self.output_file = output_file
+        # Work-queue mode: page tasks come from a SQLite queue shared with other
+        # processes and hosts, which all append to the same output and index
+        self.task_queue = TaskQueue(queue_file) if queue_file else None
+        self.lease_seconds = lease_seconds
+        self.queue_poll_seconds = queue_poll_seconds
+        # Identifies this process in job claims and task leases
+        self.owner = f"{socket.gethostname()}-{os.getpid()}"
+        if self.task_queue is not None and index_file is None:
+            index_file = f"{output_file}.index.db"
+        # append=True continues an existing output file instead of truncating it
+        self.append = append or resume or self.task_queue is not None
+        self.resume = resume
+        self.checkpoint_file = checkpoint_file or f"{output_file}.checkpoint.json"
+        # Without a job index, the seen keys are journaled here, each checkpoint appending its new ones
+        self.seen_file = f"{self.checkpoint_file}.seen"
+        # Sweep progress: finished query keys, and the position inside unfinished ones
+        self._progress = {'completed': [], 'queries': {}}
+        self._progress_lock = threading.RLock()
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        # Raw detail pages are kept here so fields can be re-extracted offline later
+        self.archive = HtmlArchive(archive_dir, archive_segment_mb) if archive_dir else None
+        # Records also go to a partitioned Parquet dataset here, besides the CSV
+        self.dataset = ParquetSink(dataset_dir, dataset_rows) if dataset_dir else None
+        # Jobs scraped by earlier runs are skipped before any navigation
+        self.job_index = JobIndex(index_file, shared=self.task_queue is not None) if index_file else None
+        # Postings already extracted within cache_ttl seconds are saved without opening them
+        self.detail_cache = DetailCache(cache_file, cache_ttl, cache_max_mb * 1024 * 1024, cache_html) \
+            if cache_file else None
+        # Reposts whose description and skills match an already saved job this closely are not stored
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+        if self.near_duplicates is not None and self.append and os.path.exists(output_file):
+            self.near_duplicates.load_csv(output_file)
+        self.base_url = base_url.rstrip('/')
+        # 'selenium' drives Chrome for everything; 'http' fetches pages directly and
+        # only starts Chrome for pages that need JavaScript to render
+        self.backend = backend
+        self.http_concurrency = http_concurrency
+        # Throttled, failed and timed-out requests are retried this many times before a page is given up
+        self.http_retries = http_retries
+        self.requests_per_second = requests_per_second
+        # 'lean' runs headless from a cached chromedriver and blocks heavy resources
+        self.profile = profile
+        # headless=None runs a pool of workers headless and a single session in a visible window
+        if headless is None:
+            headless = workers > 1
+        self.headless = headless or profile == 'lean'
+        # Long sweeps restart Chrome after this many page loads, or once its processes
+        # use more than max_browser_mb of RSS (None disables either check)
+        self.recycle_pages = recycle_pages
+        self.max_browser_mb = max_browser_mb
+        self._psutil_warned = False
+        # How often one query may replace a crashed session before it is given up
+        self.max_session_restarts = max_session_restarts
+        self.metrics = Metrics()
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self._metrics_stop = threading.Event()
+        self.direct_links = direct_links
+        # Per-query crawl limits; None (or 0 pages, e.g. from a config file) means keep
+        # paging until the results run out
+        self.max_pages = max_pages or None
+        self.max_jobs = max_jobs
+        self.js_extraction = js_extraction
+        self.ready_timeout = ready_timeout
+        # WebDriver commands spent in scrape_job_details, to compare extraction modes
+        self.extraction_stats = {'jobs': 0, 'commands': 0}
+        # Every WebDriver command sent by any of this scraper's drivers
+        self.webdriver_commands = 0
+        self._stats_lock = threading.Lock()
+        self.workers = max(1, workers)
+        # Callables every finished JobRecord is handed to; iter_jobs() adds its own
+        self._consumers = [self.save_record_to_csv]
+        # How many jobs iter_jobs() holds before the scraper waits for its reader
+        self.stream_buffer = stream_buffer
+        # Set when an iter_jobs() reader stops early; the scraper then winds down
+        self._stop = threading.Event()
+        self.rate_limiter = RateLimiter(requests_per_second)
         self.unique_jobs = set()
-        self.driver = self.setup_selenium_driver()
+        # Keys saved since the last checkpoint, still to be appended to seen_file
+        self._new_seen = []
+        self._claimed_jobs = set()
+        # Saved jobs (key -> claim owner) that enter the index at the next checkpoint_outputs()
+        self._unindexed = {}
+        self._jobs_lock = threading.Lock()
+        self._local = threading.local()
+        self._selenium_lock = threading.Lock()
+        if resume:
+            self.load_checkpoint()
+        elif os.path.exists(self.seen_file):
+            os.remove(self.seen_file)
+        # Started by the first use of self.driver, so offline work never launches Chrome;
+        # pool workers start their own, and the http backend only when a page needs it
+        self._driver = None
         self.initialize_csv()
 
+    @property
+    def driver(self):
+        """The Chrome session owned by the calling thread, started the first time it is needed"""
+        driver = getattr(self._local, 'driver', None) or self._driver
+        if driver is None:
+            driver = self._driver = self.setup_selenium_driver()
+        return driver
+
+    @driver.setter
+    def driver(self, driver):
+        if getattr(self._local, 'driver', None) is not None:
+            self._local.driver = driver
+        else:
+            self._driver = driver
+
+    def count_commands(self, driver):
+        """Count every WebDriver command sent through this driver, element calls included"""
+        execute = driver.execute
+        driver.command_count = 0
+        driver.page_count = 0
+
+        def counted_execute(driver_command, params=None):
+            driver.command_count += 1
+            if driver_command == 'get':
+                driver.page_count += 1
+            with self._stats_lock:
+                self.webdriver_commands += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        return driver
+
+    def block_heavy_resources(self, driver):
+        """Have Chrome drop image, media, font and analytics requests before they are sent"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        except WebDriverException as e:
+            logging.warning("Could not enable request blocking: %s", e)
+
     def setup_selenium_driver(self):
+        load_selenium()
         chrome_options = Options()
-        # Uncomment to run headless if needed
-        # chrome_options.add_argument("--headless")
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")  
         chrome_options.add_argument("--disable-software-rasterizer")  
@@ -45,101 +1504,140 @@ class FounditJob:
         chrome_options.page_load_strategy = 'eager'
 
         chrome_options.add_argument(f"user-agent={choice(USER_AGENTS)}")
+        if self.profile == 'lean':
+            for argument in ("--disable-extensions", "--disable-dev-shm-usage", "--no-first-run",
+                             "--disable-background-networking", "--disable-sync", "--mute-audio",
+                             "--blink-settings=imagesEnabled=false"):
+                chrome_options.add_argument(argument)
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
         try:
-            # Use webdriver-manager to automatically handle ChromeDriver compatibility
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            if self.profile == 'lean':
+                driver_path = resolve_chromedriver()
+            else:
+                # Use webdriver-manager to automatically handle ChromeDriver compatibility
+                driver_path = ChromeDriverManager().install()
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            if self.profile == 'lean':
+                self.block_heavy_resources(driver)
             driver.set_page_load_timeout(30)
             driver.set_script_timeout(30)
-            driver.implicitly_wait(10)
+            # Never stall on absent elements; readiness is handled by wait_for_page
+            driver.implicitly_wait(0)
             logging.info("Selenium WebDriver initialized successfully.")
-            return driver
+            return self.count_commands(driver)
         except WebDriverException as e:
             logging.error(f"Error initializing Selenium WebDriver: {e}")
             raise
 
+    def browser_rss_mb(self, driver):
+        """Resident memory of chromedriver and every Chrome process under it, or None without psutil"""
+        try:
+            import psutil
+        except ImportError:
+            if self.max_browser_mb and not self._psutil_warned:
+                self._psutil_warned = True
+                logging.warning("max_browser_mb=%s is not enforced: measuring Chrome's memory needs psutil "
+                                "(pip install psutil)", self.max_browser_mb)
+            return None
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def is_session_alive(self):
+        try:
+            self.driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def replace_driver(self):
+        """Swap the calling thread's Chrome session for a fresh one"""
+        try:
+            self.driver.quit()
+        except Exception:
+            # A crashed session can fail to shut down cleanly; its processes go with it
+            pass
+        self.driver = self.setup_selenium_driver()
+
+    def maybe_recycle_driver(self):
+        """Restart Chrome between result pages once it has loaded too many pages or grown too large"""
+        driver = self.driver
+        reason = None
+        pages = getattr(driver, 'page_count', 0)
+        if self.recycle_pages and pages >= self.recycle_pages:
+            reason = f"{pages} pages loaded"
+        elif self.max_browser_mb:
+            rss = self.browser_rss_mb(driver)
+            if rss is not None and rss > self.max_browser_mb:
+                reason = f"browser using {rss:.0f} MB"
+        if reason is None:
+            return False
+        logging.info("Recycling the Chrome session (%s)", reason)
+        with self.metrics.time('driver_recycle'):
+            self.replace_driver()
+        return True
+
     def initialize_csv(self):
         try:
-            # Make sure output directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(self.output_file)) or '.', exist_ok=True)
-            
-            with open(self.output_file, mode='w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    'Job Title', 
-                    'Company Name',
-                    'Salary',
-                    'Job Link',
-                    'Job Description',
-                    'More Info',
-                    'Skills Required',
-                    'About Company'
-                ])
-            print(f"✅ CSV file initialized at: {os.path.abspath(self.output_file)}")
-            logging.info(f"CSV file '{self.output_file}' initialized with headers.")
+            self.sink = CsvSink(self.output_file, CSV_HEADER, append=self.append,
+                                batch_size=self.flush_rows, flush_interval=self.flush_seconds,
+                                shared=self.task_queue is not None)
+            logging.info("CSV file initialized at: %s", os.path.abspath(self.output_file))
             return True
         except Exception as e:
-            print(f"❌ ERROR initializing CSV: {e}")
-            logging.error(f"Failed to initialize CSV file: {e}")
+            logging.error("Error initializing CSV: %s", e)
             
             # Try creating a backup file
             try:
                 backup_file = 'foundit_backup.csv'
-                with open(backup_file, mode='w', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    writer.writerow([
-                        'Job Title', 
-                        'Company Name',
-                        'Salary',
-                        'Job Link',
-                        'Job Description',
-                        'More Info',
-                        'Skills Required',
-                        'About Company'
-                    ])
-                print(f"✅ Backup CSV file initialized at: {os.path.abspath(backup_file)}")
+                self.sink = CsvSink(backup_file, CSV_HEADER, append=self.append,
+                                    batch_size=self.flush_rows, flush_interval=self.flush_seconds)
+                logging.warning("Backup CSV file initialized at: %s", os.path.abspath(backup_file))
                 self.output_file = backup_file  # Switch to backup file
             except Exception as backup_error:
-                print(f"❌ ERROR initializing backup CSV: {backup_error}")
+                logging.error("Error initializing backup CSV: %s", backup_error)
+                raise
             
             return False
 
+    def emit_job(self, job):
+        """Hand a finished JobRecord to every consumer, unless it reposts a job already emitted"""
+        if self.near_duplicates is not None:
+            original = self.near_duplicates.add_record(job.as_row())
+            if original is not None:
+                self.metrics.increment('near_duplicates_skipped')
+                logging.info("Skipping %s at %s, a repost of %s", job.title, job.company, original)
+                return False
+        for consumer in self._consumers:
+            consumer(job)
+        self.metrics.increment('jobs_saved')
+        return True
+
     def save_record_to_csv(self, record):
+        """Queue a record for the background CSV writer; never blocks on disk I/O"""
         try:
-            # Print debug info
-            print(f"\nTrying to save record to {self.output_file}:")
-            print(f"Record length: {len(record)}")
-            print(f"First few fields: {record[0]}, {record[1]}")
-            
-            # Make sure output directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(self.output_file)) or '.', exist_ok=True)
-            
-            # Write to CSV with explicit error handling
-            with open(self.output_file, mode='a', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(record)
-
-            print(f"✅ Successfully saved record to CSV file")
-            logging.info(f"Record saved to CSV: {record[0]} at {record[1]}")
+            row = record.as_row()
+            with self.metrics.time('sink_write'):
+                self.sink.write(row)
+                if self.dataset is not None:
+                    self.dataset.write(row, record.query_title, record.query_location)
+            logging.debug("Record queued for CSV: %s at %s", record.title, record.company)
             return True
         except Exception as e:
-            print(f"❌ ERROR saving to CSV: {e}")
             logging.error(f"Failed to save record to CSV: {e}")
-            
-            # Try to create a backup file if regular save failed
-            try:
-                backup_file = 'foundit_backup.csv'
-                print(f"Attempting to save to backup file: {backup_file}")
-                with open(backup_file, mode='a', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(record)
-                print(f"✅ Successfully saved to backup CSV file")
-            except Exception as backup_error:
-                print(f"❌ ERROR saving to backup CSV: {backup_error}")
-                
             return False
 
     def generate_url(self, job_title, job_location, start=0):
-        base_url = "https://www.foundit.in/srp/results"
+        base_url = f"{self.base_url}/srp/results"
         query = f"?query={job_title.replace(' ', '+')}&locations={job_location.replace(' ', '+')}&start={start}"
         return base_url + query
 
@@ -147,30 +1645,272 @@ class FounditJob:
         sleep_time = uniform(min_seconds, max_seconds)
         sleep(sleep_time)
 
+    def wait_for_page(self, markers=DETAIL_MARKERS, timeout=None):
+        """Wait until one of the markers is present or the DOM goes quiet.
+
+        Returns the marker that matched, 'quiet' if the page settled without any of
+        them, or None if neither happened within the timeout.
+        """
+        restart = [True]
+
+        def ready(driver):
+            result = driver.execute_script(PAGE_READY_JS, list(markers), DOM_QUIET_MS, restart[0])
+            restart[0] = False
+            return result
+
+        try:
+            with self.metrics.time('readiness_wait'):
+                return WebDriverWait(self.driver, timeout or self.ready_timeout, poll_frequency=0.1).until(ready)
+        except TimeoutException:
+            self.metrics.increment('readiness_timeouts')
+            logging.warning("Page not ready after %ss", timeout or self.ready_timeout)
+        except WebDriverException as e:
+            self.metrics.increment('readiness_errors')
+            logging.warning("Error waiting for page: %s", e)
+        return None
+
+    def export_metrics_periodically(self):
+        while not self._metrics_stop.wait(self.metrics_interval):
+            try:
+                self.metrics.export(self.metrics_file)
+            except OSError as e:
+                logging.warning("Could not export metrics to %s: %s", self.metrics_file, e)
+
+    def load_checkpoint(self):
+        """Restore sweep progress and the seen set from the last checkpoint"""
+        if not os.path.exists(self.checkpoint_file):
+            logging.warning("No checkpoint at %s, starting from the beginning", self.checkpoint_file)
+            return
+        with open(self.checkpoint_file, encoding='utf-8') as file:
+            state = json.load(file)
+        self._progress = {'completed': state['completed'], 'queries': state['queries']}
+        # Checkpoints from before the seen journal carry the whole set
+        self.unique_jobs.update(state.get('seen', []))
+        if os.path.exists(self.seen_file):
+            with open(self.seen_file, encoding='utf-8') as file:
+                self.unique_jobs.update(json.loads(line) for line in file if line.strip())
+        logging.info(f"Resuming from checkpoint saved at {state['saved_at']}: {len(state['completed'])} queries done, "
+                     f"{len(state['queries'])} in progress, {len(self.unique_jobs)} jobs seen")
+
+    def save_checkpoint(self):
+        """Atomically write the sweep progress so a crash costs at most the current page.
+
+        The seen set is not rewritten each time: with a job index it is already
+        persisted there, and otherwise only the keys saved since the last
+        checkpoint are appended to seen_file.
+        """
+        with self._progress_lock:
+            with self._jobs_lock:
+                new_seen, self._new_seen = self._new_seen, []
+            if new_seen:
+                with open(self.seen_file, 'a', encoding='utf-8') as file:
+                    file.write(''.join(json.dumps(key) + '\n' for key in new_seen))
+            state = json.dumps({
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'output_file': self.output_file,
+                'completed': self._progress['completed'],
+                'queries': self._progress['queries']
+            })
+            temp_file = f"{self.checkpoint_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                file.write(state)
+            os.replace(temp_file, self.checkpoint_file)
+
+    def query_progress(self, job_title, job_location):
+        """Position inside a query, or None if it already finished in an earlier run"""
+        key = f"{job_title}|{job_location}"
+        with self._progress_lock:
+            if key in self._progress['completed']:
+                return None
+            return self._progress['queries'].setdefault(key, {'start': 0, 'page': 1, 'saved': 0, 'processed': []})
+
+    def mark_card_processed(self, progress, index, saved):
+        if progress is None:
+            return
+        with self._progress_lock:
+            progress['processed'].append(index)
+            if saved:
+                progress['saved'] += 1
+
+    def advance_query(self, progress, start, page):
+        """Record that the query moved on to the next results page"""
+        with self._progress_lock:
+            progress['start'] = start
+            progress['page'] = page
+            progress['processed'] = []
+        self.checkpoint_outputs()
+        self.save_checkpoint()
+
+    def checkpoint_outputs(self):
+        """Make every record written so far durable, before progress that counts on them is saved"""
+        # Taken first: each of these jobs was emitted already, so the flush below covers its row
+        with self._jobs_lock:
+            unindexed, self._unindexed = self._unindexed, {}
+        self.sink.checkpoint()
+        if self.dataset is not None:
+            self.dataset.checkpoint()
+        self.index_jobs(unindexed)
+
+    def index_jobs(self, unindexed):
+        """Add saved jobs to the index and drop their claims, once their rows are on disk"""
+        for job_key, owner in unindexed.items():
+            self.job_index.add(job_key)
+            self.job_index.release(job_key, owner)
+
+    def finish_query(self, job_title, job_location):
+        key = f"{job_title}|{job_location}"
+        with self._progress_lock:
+            self._progress['queries'].pop(key, None)
+            self._progress['completed'].append(key)
+        self.save_checkpoint()
+
+    def build_record(self, job_title_text, company_name, job_link, details):
+        query_title, query_location = CURRENT_QUERY.get()
+        return JobRecord(
+            job_title_text,
+            company_name,
+            details['salary'],
+            job_link,
+            details['job_description'],
+            details['more_info'],
+            details['skills'],
+            details['about_company'],
+            query_title,
+            query_location,
+            datetime.now().replace(microsecond=0)
+        )
+
+    def save_cached_job(self, job_title_text, company_name, job_key, job_href):
+        """Save a claimed job straight from the detail cache; False on a miss"""
+        if self.detail_cache is None or not job_href:
+            return False
+        cached = self.detail_cache.get(job_href)
+        if cached is None:
+            CACHE_MISS_STARTED.set(monotonic())
+            return False
+        self.metrics.increment('cache_hits')
+        logging.debug("Serving %s at %s from the detail cache", job_title_text, company_name)
+        self.emit_job(self.build_record(job_title_text, company_name, cached['job_link'], cached))
+        self.release_job(job_key, saved=True)
+        return True
+
+    def cache_details(self, job_link, details, html=None):
+        if self.detail_cache is None:
+            return
+        started = CACHE_MISS_STARTED.get()
+        CACHE_MISS_STARTED.set(None)
+        # Failed extractions come back all "Not available" and are not worth keeping
+        if all(value == "Not available" for value in details.values()):
+            return
+        if html is None and self.detail_cache.store_html:
+            html = self.driver.page_source
+        fetch_seconds = monotonic() - started if started is not None else 0.0
+        self.detail_cache.put(job_link, dict(details, job_link=job_link), html, fetch_seconds)
+
+    def claim_job(self, job_key):
+        """Reserve a job key so that no two workers process the same posting"""
+        with self._jobs_lock:
+            if job_key in self.unique_jobs or job_key in self._claimed_jobs:
+                self.metrics.increment('duplicates_skipped')
+                return False
+            if self.job_index is not None and self.job_index.seen(job_key):
+                self.unique_jobs.add(job_key)
+                self.metrics.increment('duplicates_skipped')
+                return False
+            if self.job_index is not None and not self.job_index.claim(job_key, self.claim_owner()):
+                # Another process sharing the index is on it
+                self.metrics.increment('duplicates_skipped')
+                return False
+            self._claimed_jobs.add(job_key)
+            if not hasattr(self._local, 'claims'):
+                self._local.claims = set()
+            self._local.claims.add(job_key)
+            return True
+
+    def record_extraction_commands(self, commands):
+        with self._stats_lock:
+            self.extraction_stats['jobs'] += 1
+            self.extraction_stats['commands'] += commands
+        logging.debug("WebDriver commands for this job: %d", commands)
+
+    def is_known_job(self, job_key):
+        with self._jobs_lock:
+            if job_key in self.unique_jobs or job_key in self._claimed_jobs:
+                return True
+            return self.job_index is not None and self.job_index.seen(job_key)
+
+    def all_jobs_known(self, cards):
+        return all(self.is_known_job(job_dedup_key(card['title'], card['company'], card['href'])) for card in cards)
+
+    def release_job(self, job_key, saved=False):
+        with self._jobs_lock:
+            self._claimed_jobs.discard(job_key)
+            getattr(self._local, 'claims', set()).discard(job_key)
+            task_saved = getattr(self._local, 'task_saved', None)
+            if saved:
+                self.unique_jobs.add(job_key)
+                if self.job_index is None:
+                    self._new_seen.append(job_key)
+                if task_saved is not None:
+                    # Indexed, and the claim dropped, once the task's rows are on disk
+                    task_saved.append(job_key)
+                    return
+                if self.job_index is not None:
+                    # Indexed at the next checkpoint, after the row is durable
+                    self._unindexed[job_key] = self.claim_owner()
+                    return
+            elif (task_saved is not None and job_key in task_saved) or job_key in self._unindexed:
+                # Saved earlier: the claim must hold until the index has the job
+                return
+            if self.job_index is not None:
+                self.job_index.release(job_key, self.claim_owner())
+
+    def claim_owner(self):
+        """Owner of this thread's job claims: its task queue worker, or the process"""
+        return getattr(self._local, 'worker', None) or self.owner
+
+    def extract_job_details_js(self):
+        """Collect all detail fields with one execute_script call, or None if the script fails"""
+        try:
+            details = self.driver.execute_script(EXTRACT_DETAILS_JS)
+        except WebDriverException as e:
+            logging.warning("JavaScript extraction failed, falling back to element lookups: %s", e)
+            return None
+
+        logging.debug("Extracted job details in one call: %d chars of description, skills: %s, salary: %s",
+                      len(details['job_description']), details['skills'], details['salary'])
+        return {
+            'job_description': details['job_description'],
+            'more_info': details['more_info'],
+            'skills': details['skills'],
+            'about_company': details['about_company'],
+            'salary': details['salary']
+        }
+
     def scrape_job_details(self, job_link):
         """Scrape detailed information from a job details page"""
-        job_description = role = industry = function = job_type = skills = posted_date = about_company = salary = "Not available"
+        job_description = more_info = role = industry = function = job_type = skills = posted_date = about_company = \
+            salary = "Not available"
         
         try:
-            # Wait for the job details container to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "srpJdContainerTop"))
-            )
-            
-            print("Job details page loaded successfully")
+            # The caller already waited for the details view to render
+            if self.js_extraction:
+                details = self.extract_job_details_js()
+                if details is not None:
+                    return details
             
             # Job Description
             try:
                 job_desc_elem = self.driver.find_element(By.ID, 'jobDescription')
                 job_description = job_desc_elem.text.strip()
-                print(f"\n--- JOB DESCRIPTION ---\n{job_description}\n")
+                logging.debug("Job description: %s", job_description)
             except:
-                print("Job description element not found")
+                logging.debug("Job description element not found")
             
             # More Info section
             try:
-                more_info = self.driver.find_element(By.CLASS_NAME, 'moreInfo')
-                info_items = more_info.find_elements(By.TAG_NAME, 'p')
+                more_info_section = self.driver.find_element(By.CLASS_NAME, 'moreInfo')
+                info_items = more_info_section.find_elements(By.TAG_NAME, 'p')
                 
                 # Also parse individual fields for better organization
                 more_info_parts = []
@@ -200,9 +1940,9 @@ class FounditJob:
                         
                 # Create a combined more_info string with the desired format
                 more_info = "\n".join(more_info_parts)
-                print(f"\n--- MORE INFO ---\n{more_info}\n")
+                logging.debug("More info: %s", more_info)
             except:
-                print("More Info section not found")
+                logging.debug("More Info section not found")
             
             # Skills section
             try:
@@ -212,27 +1952,27 @@ class FounditJob:
                 if skill_items:
                     skills_list = [skill.text.strip() for skill in skill_items if skill.text.strip()]
                     skills = ", ".join(skills_list)
-                    print(f"\n--- SKILLS REQUIRED ---\n{skills}\n")
+                    logging.debug("Skills required: %s", skills)
             except:
-                print("Skills section not found")
+                logging.debug("Skills section not found")
             
             # About Company
             try:
                 company_section = self.driver.find_element(By.ID, 'jobCompany')
                 company_desc = company_section.find_element(By.CLASS_NAME, 'companyDesc')
                 about_company = company_desc.text.strip()
-                print(f"\n--- ABOUT COMPANY ---\n{about_company}\n")
+                logging.debug("About company: %s", about_company)
             except:
-                print("About company section not found")
+                logging.debug("About company section not found")
                 
             # Get salary if available
             try:
                 salary_element = self.driver.find_element(By.XPATH, "//span[contains(text(), 'INR') or contains(text(), 'LPA')]")
                 if salary_element:
                     salary = salary_element.text.strip()
-                    print(f"\n--- SALARY ---\n{salary}\n")
+                    logging.debug("Salary: %s", salary)
             except:
-                print("Salary information not found")
+                logging.debug("Salary information not found")
                 
             return {
                 'job_description': job_description,
@@ -243,7 +1983,7 @@ class FounditJob:
             }
                 
         except Exception as e:
-            print(f"Error scraping job details: {e}")
+            logging.warning("Error scraping job details: %s", e)
             return {
                 'job_description': "Not available",
                 'more_info': "Not available",
@@ -252,298 +1992,1000 @@ class FounditJob:
                 'salary': "Not available"
             }
 
-    def scrape(self):
+    def process_detail_page(self, job_title_text, company_name, job_key, job_link, marker=None):
+        """Save the record of the job details view the browser is on.
+
+        marker is what wait_for_page() matched, which tells a details page from the
+        popup/modal view without probing the page again.
+        """
+        if 'job-details' in job_link or 'job/' in job_link or (marker in DETAIL_MARKERS and marker != POPUP_MARKER):
+            logging.debug("On a job details page (%s)", marker or 'URL pattern')
+
+            # Extract all details from the job page
+            commands_before = getattr(self.driver, 'command_count', 0)
+            with self.metrics.time('extraction'):
+                details = self.scrape_job_details(job_link)
+            self.record_extraction_commands(getattr(self.driver, 'command_count', 0) - commands_before)
+
+            html = None
+            if self.archive is not None:
+                html = self.driver.page_source
+                self.archive.add(job_link, html, job_title_text, company_name)
+            self.cache_details(job_link, details, html)
+
+            # Create record and save to CSV
+            record = self.build_record(job_title_text, company_name, job_link, details)
+
+            self.emit_job(record)
+            self.release_job(job_key, saved=True)
+            logging.info("Saved %s at %s - total unique jobs: %d", job_title_text, company_name, len(self.unique_jobs))
+            return True
+
+        if marker != POPUP_MARKER:
+            logging.warning("Could not find job details for %s at %s. Skipping this job.", job_title_text, company_name)
+            return False
+
+        # The popup/modal view: extract what we can from it
+        job_description = "Not available"
         try:
-            for job_title in self.job_titles:
-                for job_location in self.job_locations:
-                    logging.info(f"Scraping for '{job_title}' in '{job_location}'")
-                    
-                    # Only process the first page
-                    url = self.generate_url(job_title, job_location, 0)
-                    logging.info(f"Navigating to URL: {url}")
-                    print(f"\nSearching for '{job_title}' in '{job_location}' - Page 1")
-                    
-                    # Navigate to the search results page
-                    self.driver.get(url)
-                    self.sleep_for_random_interval(3, 5)  # Longer wait for page load
-                    
-                    # Wait for page to load completely
+            # Try to find any job description content
+            job_desc_elems = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'jobDesc')]")
+            if job_desc_elems:
+                job_description = job_desc_elems[0].text.strip()
+                logging.debug("Found job description in popup: %d chars", len(job_description))
+        except:
+            pass
+
+        # Create a minimal record with what we have
+        record = self.build_record(job_title_text, company_name, job_link, {
+            'salary': "Not available",
+            'job_description': job_description,
+            'more_info': "Not available",
+            'skills': "Not available",
+            'about_company': "Not available"
+        })
+
+        self.emit_job(record)
+        self.release_job(job_key, saved=True)
+        self.metrics.increment('popup_fallbacks')
+        logging.info("Saved partial data for %s at %s (popup/modal view)", job_title_text, company_name)
+        return True
+
+    def harvest_cards(self):
+        """Read title, company and detail URL of every result card in one batch"""
+        try:
+            with self.metrics.time('card_harvest'):
+                return self.driver.execute_script(HARVEST_CARDS_JS) or []
+        except WebDriverException as e:
+            logging.warning("Error harvesting job cards: %s", e)
+            return []
+
+    def visit_harvested_cards(self, cards, jobs_left=None, progress=None):
+        """Open harvested detail URLs directly, returning the indexes of cards without a link and the saved count"""
+        click_indexes = []
+        saved = 0
+        processed = set(progress['processed']) if progress else set()
+        for card in cards:
+            if (jobs_left is not None and saved >= jobs_left) or self._stop.is_set():
+                break
+            if card['index'] in processed:
+                continue
+            if not card.get('href'):
+                click_indexes.append(card['index'])
+                continue
+
+            job_title_text = card['title']
+            company_name = card['company']
+            job_key = job_dedup_key(job_title_text, company_name, card['href'])
+
+            # Dedup before any navigation
+            if not self.claim_job(job_key):
+                logging.debug("Skipping duplicate job: %s at %s", job_title_text, company_name)
+                continue
+
+            logging.debug("Job: %s at %s", job_title_text, company_name)
+
+            if self.save_cached_job(job_title_text, company_name, job_key, card['href']):
+                saved += 1
+                self.mark_card_processed(progress, card['index'], True)
+                continue
+
+            self.rate_limiter.wait()
+            with self.metrics.time('navigate'):
+                self.driver.get(card['href'])
+            marker = self.wait_for_page()
+
+            job_link = self.driver.current_url
+            logging.debug("Job URL: %s", job_link)
+            job_saved = self.process_detail_page(job_title_text, company_name, job_key, job_link, marker)
+            saved += job_saved
+            self.release_job(job_key)
+            self.mark_card_processed(progress, card['index'], job_saved)
+
+        return click_indexes, saved
+
+    def load_results_page(self, url, start, prefetched=False):
+        """Make sure the results page at this offset is loaded and return its job cards"""
+        if prefetched:
+            # The page was requested while the previous one was being extracted
+            try:
+                WebDriverWait(self.driver, self.ready_timeout).until(lambda d: f"start={start}" in d.current_url)
+            except TimeoutException:
+                prefetched = False
+
+        with self.metrics.time('search_page_load'):
+            if not prefetched:
+                # Navigate to the search results page
+                self.rate_limiter.wait()
+                self.driver.get(url)
+
+            # Wait for the cards, or for the page to settle without any (no more results)
+            ready = self.wait_for_page(RESULTS_MARKERS)
+            if ready is None:
+                # A timeout says nothing about the results, so load the page once more
+                self.rate_limiter.wait()
+                self.driver.get(url)
+                ready = self.wait_for_page(RESULTS_MARKERS)
+        if ready is None:
+            # The query stays unfinished in the checkpoint
+            raise TimeoutException(f"Results page not ready after two loads: {url}")
+        if ready not in RESULTS_MARKERS:
+            logging.debug("No job cards on this page (end of results, or the page structure changed)")
+            return []
+
+        # Find job cards
+        return self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
+
+    def scrape_query(self, job_title, job_location):
+        """Stream through the result pages of one query until they run out or a limit is hit"""
+        progress = self.query_progress(job_title, job_location)
+        if progress is None:
+            logging.info("Skipping '%s' in '%s', already completed before the checkpoint", job_title, job_location)
+            return
+        logging.info(f"Scraping for '{job_title}' in '{job_location}'")
+        CURRENT_QUERY.set((job_title, job_location))
+        saved = progress['saved']
+        start = progress['start']
+        page = progress['page']
+        prefetched = False
+        # A page an earlier run stopped part-way through has known jobs by design, so the
+        # all-known stop below must not end the query there
+        resumed_page = bool(progress['processed'])
+
+        while True:
+            url = self.generate_url(job_title, job_location, start)
+            logging.info("Searching for '%s' in '%s' - page %d: %s", job_title, job_location, page, url)
+            if self.maybe_recycle_driver():
+                # The new session starts blank, so a prefetched page is gone
+                prefetched = False
+
+            job_cards = self.load_results_page(url, start, prefetched)
+            if not job_cards:
+                logging.info("No more job listings for %s in %s.", job_title, job_location)
+                break
+
+            num_cards = len(job_cards)
+            logging.info(f"Found {num_cards} job cards on page {page}")
+
+            cards = self.harvest_cards()
+            if cards and not resumed_page and self.all_jobs_known(cards):
+                logging.info("Every job on page %d is already known. Stopping this query.", page)
+                break
+
+            last_page = self.max_pages is not None and page >= self.max_pages
+            next_url = None if last_page else self.generate_url(job_title, job_location, start + num_cards)
+            jobs_left = self.max_jobs - saved if self.max_jobs is not None else None
+
+            page_saved, prefetched = self.scrape_results_page(url, num_cards, cards, jobs_left, next_url, progress)
+            saved += page_saved
+
+            if last_page or (self.max_jobs is not None and saved >= self.max_jobs) or self._stop.is_set():
+                break
+            start += num_cards
+            page += 1
+            resumed_page = False
+            self.advance_query(progress, start, page)
+
+        # Make the query's rows durable before moving on
+        self.checkpoint_outputs()
+        if self._stop.is_set():
+            # Stopped by an iter_jobs() reader; the query stays in the checkpoint for resume=True
+            return
+        self.finish_query(job_title, job_location)
+        logging.info("Completed processing %d jobs for %s in %s", len(self.unique_jobs), job_title, job_location)
+
+    def scrape_query_with_recovery(self, job_title, job_location):
+        """Run scrape_query, replacing the Chrome session and resuming from the current page if it dies"""
+        for attempt in range(self.max_session_restarts + 1):
+            try:
+                return self.scrape_query(job_title, job_location)
+            except WebDriverException as e:
+                if attempt == self.max_session_restarts or self.is_session_alive():
+                    raise
+                logging.warning("Chrome session died during '%s' in '%s' (%s). Restarting it and resuming.",
+                                job_title, job_location, e.msg)
+                self.metrics.increment('session_restarts')
+                # Jobs this thread was in the middle of were never saved, so let the retry take them
+                with self._jobs_lock:
+                    self._claimed_jobs.difference_update(getattr(self._local, 'claims', set()))
+                    self._local.claims = set()
+                self.replace_driver()
+
+    def scrape_results_page(self, url, num_cards, cards, jobs_left=None, next_url=None, progress=None,
+                            card_indexes=None):
+        """Process the cards of the loaded results page, returning the saved count and whether next_url was prefetched"""
+        saved = 0
+        prefetched = False
+        # card_indexes, when given, limits the page to those cards, clicked one by one
+        if card_indexes is None:
+            card_indexes = range(num_cards)
+            if self.direct_links and cards:
+                if next_url and all(card.get('href') for card in cards):
+                    # Nothing needs the results page any more, so let it load the next
+                    # page in the background while the details are read in a second tab
+                    results_tab = self.driver.current_window_handle
+                    self.rate_limiter.wait()
+                    self.driver.execute_script("window.location.href = arguments[0];", next_url)
+                    prefetched = True
+                    self.driver.switch_to.new_window('tab')
                     try:
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.CLASS_NAME, 'srpResultCardContainer'))
-                        )
-                    except TimeoutException:
-                        print("Timeout waiting for job cards to load. Check if page structure has changed.")
-                        continue
+                        card_indexes, saved = self.visit_harvested_cards(cards, jobs_left, progress)
+                    finally:
+                        self.driver.close()
+                        self.driver.switch_to.window(results_tab)
+                    return saved, prefetched
 
-                    # Find job cards
+                card_indexes, saved = self.visit_harvested_cards(cards, jobs_left, progress)
+                # Only cards without a link are left for the click path below
+                if card_indexes and len(card_indexes) < len(cards):
+                    self.rate_limiter.wait()
+                    self.driver.get(url)
+                    self.wait_for_page(RESULTS_MARKERS)
+
+        # Process each job card one by one, skipping any finished before a resume
+        processed = set(progress['processed']) if progress else set()
+        for i in card_indexes:
+            if (jobs_left is not None and saved >= jobs_left) or self._stop.is_set():
+                break
+            if i in processed:
+                continue
+            logging.debug("Processing job %d/%d", i + 1, num_cards)
+
+            # Re-get job cards before each access to avoid stale references
+            try:
+                job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
+                if i >= len(job_cards):
+                    logging.debug("Job card index %d out of range. Refreshing page.", i)
+                    self.rate_limiter.wait()
+                    self.driver.refresh()
+                    self.wait_for_page(RESULTS_MARKERS)
                     job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
-                    
-                    if not job_cards:
-                        logging.warning("No job cards found on this page.")
-                        print(f"No job listings found for {job_title} in {job_location}.")
+                    if i >= len(job_cards):
+                        logging.warning("Still can't find job card %d. Skipping.", i + 1)
                         continue
-                    
-                    num_cards = len(job_cards)
-                    logging.info(f"Found {num_cards} job cards on page 1")
-                    print(f"Found {num_cards} job listings to process")
-                    
-                    # Process each job card one by one
-                    for i in range(num_cards):
-                        print(f"\n{'='*50}")
-                        print(f"Processing job {i+1}/{num_cards}")
-                        print(f"{'-'*50}")
-                        
-                        # Re-get job cards before each access to avoid stale references
-                        try:
-                            job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
-                            if i >= len(job_cards):
-                                print(f"Job card index {i} out of range. Refreshing page.")
-                                self.driver.refresh()
-                                self.sleep_for_random_interval(2, 3)
-                                job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
-                                if i >= len(job_cards):
-                                    print(f"Still can't find job card {i+1}. Skipping.")
-                                    continue
-                        except Exception as e:
-                            print(f"Error refreshing job cards: {e}")
-                            self.driver.get(url)
-                            self.sleep_for_random_interval(2, 3)
-                            job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
-                            if i >= len(job_cards):
-                                print(f"Cannot find job card {i+1} after refresh. Skipping.")
-                                continue
-                        
-                        current_card = job_cards[i]
-                        
-                        # Extract basic info from the card before clicking
+            except Exception as e:
+                logging.warning("Error refreshing job cards: %s", e)
+                self.rate_limiter.wait()
+                self.driver.get(url)
+                self.wait_for_page(RESULTS_MARKERS)
+                job_cards = self.driver.find_elements(By.CLASS_NAME, 'srpResultCardContainer')
+                if i >= len(job_cards):
+                    logging.warning("Cannot find job card %d after refresh. Skipping.", i + 1)
+                    continue
+
+            current_card = job_cards[i]
+
+            # Extract basic info from the card before clicking
+            try:
+                # Get job title
+                job_title_elem = current_card.find_element(By.CLASS_NAME, 'jobTitle')
+                job_title_text = job_title_elem.text.strip()
+
+                # Get company name
+                company_elem = current_card.find_element(By.CLASS_NAME, 'companyName')
+                company_name = company_elem.text.strip()
+
+                # Create unique identifier, preferring the job ID from the harvested link
+                job_href = cards[i]['href'] if i < len(cards) else None
+                job_key = job_dedup_key(job_title_text, company_name, job_href)
+
+                # Skip if we've seen this job before (or another worker is on it)
+                if not self.claim_job(job_key):
+                    logging.debug("Skipping duplicate job: %s at %s", job_title_text, company_name)
+                    continue
+
+                logging.debug("Job: %s at %s", job_title_text, company_name)
+            except Exception as e:
+                logging.warning("Error extracting basic info from card: %s", e)
+                continue
+
+            if self.save_cached_job(job_title_text, company_name, job_key, job_href):
+                saved += 1
+                self.mark_card_processed(progress, i, True)
+                continue
+
+            # Scroll card into view
+            try:
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", current_card)
+            except Exception as e:
+                logging.debug("Error scrolling to card: %s", e)
+
+            # Click on the job card to view details
+            logging.debug("Clicking on job card...")
+            self.rate_limiter.wait()
+            try:
+                with self.metrics.time('navigate'):
+                    # Try clicking on job title first
+                    try:
+                        job_title_elem.click()
+                    except:
+                        # Try clicking the card itself
                         try:
-                            # Get job title
-                            job_title_elem = current_card.find_element(By.CLASS_NAME, 'jobTitle')
-                            job_title_text = job_title_elem.text.strip()
-                            
-                            # Get company name
-                            company_elem = current_card.find_element(By.CLASS_NAME, 'companyName')
-                            company_name = company_elem.text.strip()
-                            
-                            # Create unique identifier
-                            job_key = f"{job_title_text}_{company_name}"
-                            
-                            # Skip if we've seen this job before
-                            if job_key in self.unique_jobs:
-                                print(f"Skipping duplicate job: {job_title_text} at {company_name}")
-                                continue
-                                
-                            print(f"Job: {job_title_text}")
-                            print(f"Company: {company_name}")
-                        except Exception as e:
-                            print(f"Error extracting basic info from card: {e}")
+                            current_card.click()
+                        except:
+                            # Try JavaScript click as last resort
+                            self.driver.execute_script("arguments[0].click();", job_title_elem)
+            except Exception as e:
+                logging.warning("Failed to click job card: %s", e)
+                self.release_job(job_key)
+                continue
+
+            # Wait for job details page to load
+            marker = self.wait_for_page()
+
+            # Get job link
+            job_link = self.driver.current_url
+            logging.debug("Job URL: %s", job_link)
+
+            job_saved = self.process_detail_page(job_title_text, company_name, job_key, job_link, marker)
+            saved += job_saved
+
+            self.release_job(job_key)
+            self.mark_card_processed(progress, i, job_saved)
+
+            # Go back to search results page for next job
+            logging.debug("Returning to search results page...")
+            self.rate_limiter.wait()
+            self.driver.get(url)
+            self.wait_for_page(RESULTS_MARKERS)
+
+        return saved, prefetched
+
+    def scrape_with_pool(self):
+        """Shard the title x location pairs across a pool of Chrome sessions"""
+        pairs = queue.Queue()
+        for job_title in self.job_titles:
+            for job_location in self.job_locations:
+                pairs.put((job_title, job_location))
+
+        def worker(worker_id):
+            self._local.driver = self.setup_selenium_driver()
+            try:
+                while not self._stop.is_set():
+                    try:
+                        job_title, job_location = pairs.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        self.scrape_query_with_recovery(job_title, job_location)
+                    except Exception as e:
+                        logging.error(f"[Worker {worker_id}] Failed '{job_title}' in '{job_location}': {e}")
+            finally:
+                self._local.driver.quit()
+
+        num_workers = min(self.workers, pairs.qsize())
+        if not num_workers:
+            return
+        logging.info(f"Starting {num_workers} Chrome workers for {pairs.qsize()} queries")
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            list(pool.map(worker, range(num_workers)))
+
+    def scrape_from_queue(self):
+        """Work-queue mode: seed this instance's queries, then work leased page tasks until none are left"""
+        for job_title in self.job_titles:
+            for job_location in self.job_locations:
+                self.task_queue.put(job_title, job_location)
+        if self.workers == 1:
+            self.work_queue(self.owner)
+            return
+
+        def worker(worker_id):
+            self._local.driver = self.setup_selenium_driver()
+            try:
+                self.work_queue(f"{self.owner}-{worker_id}")
+            finally:
+                self._local.driver.quit()
+
+        logging.info(f"Starting {self.workers} Chrome workers on the task queue")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(worker, range(self.workers)))
+
+    def work_queue(self, worker):
+        while not self._stop.is_set():
+            task = self.task_queue.lease(worker, self.lease_seconds)
+            if task is None:
+                counts = self.task_queue.counts()
+                if not counts.get('pending') and not counts.get('leased'):
+                    logging.info("Task queue drained: %s", counts)
+                    return
+                # Other workers still hold leases that may expire and come back
+                sleep(self.queue_poll_seconds)
+                continue
+            self.run_task(task, worker)
+
+    def run_task(self, task, worker):
+        """Scrape one leased task while a heartbeat thread keeps the lease alive"""
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.task_queue.heartbeat(task, worker, self.lease_seconds):
+                    logging.warning("Lost the lease on '%s' in '%s' page %d", task['title'], task['location'],
+                                    task['page'])
+                    self.metrics.increment('leases_lost')
+                    return
+
+        if task['previous_worker'] and task['previous_worker'] != worker:
+            # Its lease ran out, so whatever it was extracting is up for grabs again
+            self.job_index.release_owner(task['previous_worker'])
+        self._local.worker = worker
+        self._local.task_saved = []
+        threading.Thread(target=heartbeat, name='lease-heartbeat', daemon=True).start()
+        next_task = failure = None
+        try:
+            next_task = self.scrape_task(task)
+        except Exception as e:
+            logging.error(f"Task '{task['title']}' in '{task['location']}' page {task['page']} failed: {e}")
+            failure = e
+        finally:
+            stop.set()
+            # Jobs only enter the shared index after their rows are on disk, so a worker
+            # that dies mid-task loses nothing: its task is re-leased and redone
+            self.checkpoint_outputs()
+            for job_key in self._local.task_saved:
+                self.job_index.add(job_key)
+            self.job_index.release_owner(worker)
+            self._local.task_saved = None
+
+        if failure is not None:
+            self.metrics.increment('tasks_failed')
+            self.task_queue.fail(task, worker)
+            if isinstance(failure, WebDriverException) and not self.is_session_alive():
+                self.replace_driver()
+            return
+        if self._stop.is_set():
+            # The reader stopped part-way through the page; its saved jobs are indexed, the rest is redone later
+            self.task_queue.requeue(task, worker)
+            return
+        self.task_queue.complete(task, worker, next_task)
+        self.metrics.increment('tasks_completed')
+
+    def scrape_task(self, task):
+        """Scrape the results page of a task and return the task for the page after it, or None"""
+        job_title, job_location, page, start = task['title'], task['location'], task['page'], task['start']
+        CURRENT_QUERY.set((job_title, job_location))
+        self.maybe_recycle_driver()
+        url = self.generate_url(job_title, job_location, start)
+        logging.info("Task '%s' in '%s' - page %d: %s", job_title, job_location, page, url)
+
+        job_cards = self.load_results_page(url, start)
+        if not job_cards:
+            logging.info("No more job listings for %s in %s.", job_title, job_location)
+            return None
+        cards = self.harvest_cards()
+        # A re-leased task may have had its page saved by the worker before, so it always goes on
+        if cards and not task['previous_worker'] and self.all_jobs_known(cards):
+            logging.info("Every job on page %d is already known. Stopping this query.", page)
+            return None
+
+        jobs_left = self.max_jobs - task['saved'] if self.max_jobs is not None else None
+        saved = task['saved'] + self.scrape_results_page(url, len(job_cards), cards, jobs_left)[0]
+        if (self.max_pages is not None and page >= self.max_pages) or \
+                (self.max_jobs is not None and saved >= self.max_jobs):
+            return None
+        return {'title': job_title, 'location': job_location, 'page': page + 1,
+                'start': start + len(job_cards), 'saved': saved}
+
+    def parse_search_page(self, html, page_url):
+        """Parse result cards out of raw search page HTML, mirroring HARVEST_CARDS_JS"""
+        import lxml.html
+
+        doc = lxml.html.fromstring(html)
+        cards = []
+        for index, card in enumerate(doc.find_class('srpResultCardContainer')):
+            title = card.find_class('jobTitle')
+            company = card.find_class('companyName')
+            links = (card.xpath(".//a[contains(@href, 'job')]") or card.xpath("ancestor::a[@href]")
+                     or card.xpath(".//a[@href]"))
+            cards.append({
+                'index': index,
+                'title': title[0].text_content().strip() if title else '',
+                'company': company[0].text_content().strip() if company else '',
+                'href': urljoin(page_url, links[0].get('href')) if links else None
+            })
+        return cards
+
+    async def fetch_html(self, session, url):
+        """GET a page under its host's concurrency semaphore and rate limit, or None if it could not be fetched"""
+        import asyncio
+
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            # The site itself shares the browser fallbacks' limiter, so together they keep one budget
+            limiter = self.rate_limiter if host == urlsplit(self.base_url).netloc else \
+                RateLimiter(self.requests_per_second)
+            self._host_limits[host] = (asyncio.Semaphore(self.http_concurrency), limiter)
+        semaphore, limiter = self._host_limits[host]
+
+        for attempt in range(self.http_retries + 1):
+            retry_after = None
+            async with semaphore:
+                await limiter.wait_async()
+                try:
+                    with self.metrics.time('http_fetch'):
+                        async with session.get(url) as response:
+                            if response.status == 200:
+                                return await response.text()
+                            self.metrics.increment('http_errors')
+                            logging.warning("HTTP %d for %s", response.status, url)
+                            if response.status not in RETRY_STATUSES:
+                                return None
+                            retry_after = response.headers.get('Retry-After')
+                except Exception as e:
+                    self.metrics.increment('http_errors')
+                    logging.warning("Error fetching %s: %s", url, e)
+            if attempt < self.http_retries:
+                # Back off outside the semaphore, so other pages of the host keep going
+                delay = HTTP_RETRY_DELAY * 2 ** attempt
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                await asyncio.sleep(delay)
+        return None
+
+    def run_in_browser(self, method, *args):
+        """Run a Selenium-path method for a page the http backend could not handle"""
+        self.metrics.increment('browser_fallbacks')
+        with self._selenium_lock:
+            if self._driver is None:
+                self._driver = self.setup_selenium_driver()
+            elif not self.is_session_alive():
+                logging.warning("Chrome session died, starting a new one")
+                self.metrics.increment('session_restarts')
+                self.replace_driver()
+            return method(*args)
+
+    def browser_detail_page(self, job_title_text, company_name, job_key, job_link):
+        self.rate_limiter.wait()
+        self.driver.get(job_link)
+        marker = self.wait_for_page()
+        return self.process_detail_page(job_title_text, company_name, job_key, self.driver.current_url, marker)
+
+    def browser_results_page(self, url, start, cards, jobs_left, progress=None):
+        """Click through the cards the HTTP parser found no link for"""
+        num_cards = len(self.load_results_page(url, start))
+        linkless = [card['index'] for card in cards if not card['href']]
+        return self.scrape_results_page(url, num_cards, cards, jobs_left, progress=progress,
+                                        card_indexes=linkless)[0]
+
+    async def scrape_detail_http(self, session, card, progress=None):
+        import asyncio
+
+        job_title_text = card['title']
+        company_name = card['company']
+        job_key = job_dedup_key(job_title_text, company_name, card['href'])
+        if self.save_cached_job(job_title_text, company_name, job_key, card['href']):
+            self.mark_card_processed(progress, card['index'], True)
+            return True
+        html = await self.fetch_html(session, card['href'])
+        with self.metrics.time('extraction'):
+            details = parse_job_details(html) if html else None
+
+        try:
+            if details is None:
+                logging.info("Details page needs the browser: %s", card['href'])
+                job_saved = await asyncio.to_thread(self.run_in_browser, self.browser_detail_page,
+                                                    job_title_text, company_name, job_key, card['href'])
+                self.mark_card_processed(progress, card['index'], job_saved)
+                return job_saved
+
+            if self.archive is not None:
+                self.archive.add(card['href'], html, job_title_text, company_name)
+            self.cache_details(card['href'], details, html)
+            record = self.build_record(job_title_text, company_name, card['href'], details)
+            self.emit_job(record)
+            self.release_job(job_key, saved=True)
+            self.mark_card_processed(progress, card['index'], True)
+            return True
+        finally:
+            self.release_job(job_key)
+
+    async def scrape_query_http(self, session, job_title, job_location):
+        """Page through one query over plain HTTP, fetching the new detail pages of each page concurrently"""
+        import asyncio
+
+        progress = self.query_progress(job_title, job_location)
+        if progress is None:
+            logging.info("Skipping '%s' in '%s', already completed before the checkpoint", job_title, job_location)
+            return
+        logging.info(f"Scraping for '{job_title}' in '{job_location}' over HTTP")
+        CURRENT_QUERY.set((job_title, job_location))
+        saved = progress['saved']
+        start = progress['start']
+        page = progress['page']
+        # As in scrape_query: the page being resumed never counts as all-known
+        resumed_page = bool(progress['processed'])
+
+        while True:
+            url = self.generate_url(job_title, job_location, start)
+            html = await self.fetch_html(session, url)
+            if html is None:
+                # Not the end of the results: leave the query in the checkpoint for a resumed run
+                logging.warning("Could not fetch page %d of %s in %s, leaving the query unfinished",
+                                page, job_title, job_location)
+                await asyncio.to_thread(self.checkpoint_outputs)
+                return
+            with self.metrics.time('card_harvest'):
+                cards = self.parse_search_page(html, url)
+
+            if not cards:
+                if page == 1:
+                    # Results are rendered client-side for this query, so crawl it in the browser
+                    logging.info("No job cards in the raw HTML for %s in %s, using the browser", job_title, job_location)
+                    # scrape_query checkpoints and finishes the query itself
+                    await asyncio.to_thread(self.run_in_browser, self.scrape_query, job_title, job_location)
+                    return
+                break
+
+            if not resumed_page and self.all_jobs_known(cards):
+                logging.info("Every job on page %d is already known. Stopping this query.", page)
+                break
+
+            jobs_left = self.max_jobs - saved if self.max_jobs is not None else None
+            processed = set(progress['processed'])
+            linked = []
+            for card in cards:
+                if (jobs_left is not None and len(linked) >= jobs_left) or self._stop.is_set():
+                    break
+                if card['index'] in processed:
+                    continue
+                if card['href'] and self.claim_job(job_dedup_key(card['title'], card['company'], card['href'])):
+                    linked.append(card)
+
+            results = await asyncio.gather(*(self.scrape_detail_http(session, card, progress) for card in linked))
+            saved += sum(1 for result in results if result)
+
+            if any(not card['href'] for card in cards):
+                # Cards without a link in the HTML can only be clicked in the browser
+                jobs_left = self.max_jobs - saved if self.max_jobs is not None else None
+                try:
+                    saved += await asyncio.to_thread(self.run_in_browser, self.browser_results_page, url, start,
+                                                     cards, jobs_left, progress)
+                except TimeoutException as e:
+                    logging.warning("%s, leaving %s in %s unfinished", e.msg, job_title, job_location)
+                    await asyncio.to_thread(self.checkpoint_outputs)
+                    return
+
+            if (self.max_pages is not None and page >= self.max_pages) or \
+                    (self.max_jobs is not None and saved >= self.max_jobs) or self._stop.is_set():
+                break
+            start += len(cards)
+            page += 1
+            resumed_page = False
+            await asyncio.to_thread(self.advance_query, progress, start, page)
+
+        await asyncio.to_thread(self.checkpoint_outputs)
+        if self._stop.is_set():
+            return
+        await asyncio.to_thread(self.finish_query, job_title, job_location)
+        logging.info("Completed %d jobs for %s in %s over HTTP", saved, job_title, job_location)
+
+    def iter_jobs(self):
+        """Run scrape() in the background and yield each JobRecord as soon as it is extracted.
+
+        The CSV and dataset outputs still receive every job. At most stream_buffer jobs wait
+        for the reader; beyond that the scraper blocks, so a slow reader slows the scrape
+        instead of growing memory. Leaving the loop early stops the scrape and keeps the
+        checkpoint, so resume=True continues where it left off.
+        """
+        jobs = queue.Queue(maxsize=max(1, self.stream_buffer))
+        done = object()
+
+        def publish(job):
+            # Wait for room, but give up once the reader has gone away
+            while not self._stop.is_set():
+                try:
+                    jobs.put(job, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def run():
+            try:
+                self.scrape()
+            finally:
+                # The reader may be waiting on an empty queue, so the sentinel must get through
+                while True:
+                    try:
+                        jobs.put(done, timeout=0.5)
+                        break
+                    except queue.Full:
+                        if self._stop.is_set():
+                            break
+
+        self._stop.clear()
+        self._consumers.append(publish)
+        worker = threading.Thread(target=run, name='job-stream', daemon=True)
+        worker.start()
+        try:
+            while True:
+                job = jobs.get()
+                if job is done:
+                    return
+                yield job
+        finally:
+            self._stop.set()
+            worker.join()
+            self._consumers.remove(publish)
+            self._stop.clear()
+
+    async def aiter_jobs(self):
+        """Async form of iter_jobs() for use inside an event loop: async for job in scraper.aiter_jobs()"""
+        import asyncio
+
+        done = object()
+        jobs = self.iter_jobs()
+        try:
+            while True:
+                job = await asyncio.to_thread(next, jobs, done)
+                if job is done:
+                    return
+                yield job
+        finally:
+            await asyncio.to_thread(jobs.close)
+
+    async def scrape_http(self):
+        """Browserless backend: aiohttp for fetching, lxml for parsing (pip install aiohttp lxml)"""
+        import asyncio
+        import aiohttp
+
+        self._host_limits = {}
+        headers = {'User-Agent': choice(USER_AGENTS)}
+        async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as session:
+            await asyncio.gather(*(self.scrape_query_http(session, job_title, job_location)
+                                   for job_title in self.job_titles for job_location in self.job_locations))
+
+    def scrape(self):
+        completed = False
+        if self.metrics_file:
+            threading.Thread(target=self.export_metrics_periodically, name='metrics-export', daemon=True).start()
+        try:
+            if self.task_queue is not None:
+                self.scrape_from_queue()
+            elif self.backend == 'http':
+                import asyncio
+                asyncio.run(self.scrape_http())
+            elif self.workers > 1:
+                self.scrape_with_pool()
+            else:
+                for job_title in self.job_titles:
+                    for job_location in self.job_locations:
+                        if self._stop.is_set():
                             continue
-                        
-                        # Scroll card into view
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", current_card)
-                            self.sleep_for_random_interval(1, 2)
-                        except Exception as e:
-                            print(f"Error scrolling to card: {e}")
-                        
-                        # Click on the job card to view details
-                        print("Clicking on job card...")
                         try:
-                            # Try clicking on job title first
-                            try:
-                                job_title_elem.click()
-                            except:
-                                # Try clicking the card itself
-                                try:
-                                    current_card.click()
-                                except:
-                                    # Try JavaScript click as last resort
-                                    self.driver.execute_script("arguments[0].click();", job_title_elem)
-                        except Exception as e:
-                            print(f"Failed to click job card: {e}")
-                            continue
-                        
-                        # Wait for job details page to load
-                        self.sleep_for_random_interval(3, 5)
-                        
-                        # Get job link
-                        job_link = self.driver.current_url
-                        print(f"Job URL: {job_link}")
-                        
-                        # Check if we're on a job details page - MODIFIED to detect job details more reliably
-                        is_job_details_page = False
-                        
-                        # Method 1: Check URL pattern
-                        if 'job-details' in job_link or 'job/' in job_link:
-                            is_job_details_page = True
-                            print("Detected job details page via URL pattern")
-                        
-                        # Method 2: Check for job details container
-                        if not is_job_details_page:
-                            try:
-                                # Look for the srpJdContainerTop div which contains job details
-                                job_details_container = self.driver.find_element(By.ID, 'srpJdContainerTop')
-                                if job_details_container:
-                                    is_job_details_page = True
-                                    print("Detected job details page via job details container")
-                            except:
-                                pass
-                                
-                        # Method 3: Check for job description section
-                        if not is_job_details_page:
-                            try:
-                                job_desc_elem = self.driver.find_element(By.ID, 'jobDescription')
-                                if job_desc_elem:
-                                    is_job_details_page = True
-                                    print("Detected job details page via job description element")
-                            except:
-                                pass
-                        
-                        # Check for other common elements on job details pages
-                        if not is_job_details_page:
-                            try:
-                                # Check for skills section
-                                skills_section = self.driver.find_element(By.ID, 'skillScoreSection')
-                                if skills_section:
-                                    is_job_details_page = True
-                                    print("Detected job details page via skills section")
-                            except:
-                                pass
-                                
-                        # Final check - look for more info section
-                        if not is_job_details_page:
-                            try:
-                                more_info = self.driver.find_element(By.CLASS_NAME, 'moreInfo')
-                                if more_info:
-                                    is_job_details_page = True
-                                    print("Detected job details page via more info section")
-                            except:
-                                pass
-                        
-                        if is_job_details_page:
-                            print("Successfully detected job details page")
-                            
-                            # Extract all details from the job page
-                            details = self.scrape_job_details(job_link)
-                            
-                            # Create record and save to CSV
-                            record = [
-                                job_title_text,
-                                company_name,
-                                details['salary'],
-                                job_link,
-                                details['job_description'],
-                                details['more_info'],
-                                details['skills'],
-                                details['about_company']
-                            ]
-                            
-                            self.save_record_to_csv(record)
-                            self.unique_jobs.add(job_key)
-                            print(f"✅ Saved to CSV - Total unique jobs: {len(self.unique_jobs)}")
-                        else:
-                            print("WARNING: Not on a job details page. Could not find job details elements")
-                            
-                            # Try an alternative approach - see if we're in a popup/modal
-                            try:
-                                print("Trying to detect job details in popup/modal...")
-                                
-                                # Look for common job details elements in any container
-                                job_title_elem = self.driver.find_element(By.CLASS_NAME, 'jdTitle')
-                                if job_title_elem:
-                                    print("Found job title in popup/modal")
-                                    
-                                    # Try to extract what we can from this view
-                                    job_description = "Not available"
-                                    try:
-                                        # Try to find any job description content
-                                        job_desc_elems = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'jobDesc')]")
-                                        if job_desc_elems:
-                                            job_description = job_desc_elems[0].text.strip()
-                                            print(f"Found job description in popup: {len(job_description)} chars")
-                                    except:
-                                        pass
-                                    
-                                    # Create a minimal record with what we have
-                                    record = [
-                                        job_title_text,
-                                        company_name,
-                                        "Not available",  # salary
-                                        job_link,
-                                        job_description,
-                                        "Not available",  # more info
-                                        "Not available",  # skills
-                                        "Not available"   # about company
-                                    ]
-                                    
-                                    self.save_record_to_csv(record)
-                                    self.unique_jobs.add(job_key)
-                                    print(f"✅ Saved partial data to CSV (popup/modal view)")
-                            except:
-                                print("Could not find job details in popup/modal either. Skipping this job.")
-                        
-                        # Go back to search results page for next job
-                        print("Returning to search results page...")
-                        self.driver.get(url)
-                        self.sleep_for_random_interval(2, 3)
-                        
-                    print(f"\n{'#'*50}")
-                    print(f"Completed processing {len(self.unique_jobs)} jobs for {job_title} in {job_location}")
-                    print(f"{'#'*50}")
-            
-            print("\nScraping completed successfully!")
+                            self.scrape_query_with_recovery(job_title, job_location)
+                        except TimeoutException as e:
+                            # Left unfinished in the checkpoint; the other queries can still run
+                            logging.error(f"Failed '{job_title}' in '{job_location}': {e.msg}")
+
+            completed = not self._stop.is_set()
+            if completed:
+                logging.info("Scraping completed successfully!")
+            else:
+                logging.info("Scraping stopped early by the job stream's reader.")
+            if self.extraction_stats['jobs']:
+                average = self.extraction_stats['commands'] / self.extraction_stats['jobs']
+                mode = 'javascript' if self.js_extraction else 'element lookups'
+                logging.info(f"Average WebDriver commands per job ({mode}): {average:.1f}")
             
         except Exception as e:
             logging.error(f"[ERROR] {e}")
         finally:
-            self.driver.quit()
+            if self._driver is not None:
+                self._driver.quit()
+            self.sink.close()
+            if self.dataset is not None:
+                self.dataset.close()
+                logging.info("%d records written to the dataset at '%s'.", self.dataset.rows_written, self.dataset.path)
+            if self.job_index is not None:
+                # Jobs saved since the last checkpoint, whose rows close() has just written
+                self.index_jobs(self._unindexed)
+                self.job_index.close()
+            if self.archive is not None:
+                logging.info("Archived %d pages (%.1f MB compressed) in '%s'.", self.archive.pages_written,
+                             self.archive.bytes_written / (1024 * 1024), self.archive.path)
+                self.archive.close()
+            if self.near_duplicates is not None:
+                logging.info(self.near_duplicates.summary())
+            if self.detail_cache is not None:
+                logging.info(self.detail_cache.summary())
+                self.detail_cache.close()
+            if self.task_queue is not None:
+                # The queue itself records progress; other workers may still be using it
+                logging.info("Task queue: %s", self.task_queue.counts())
+                self.task_queue.close()
+            # Keep the checkpoint while any query is unfinished so resume=True can pick it up
+            elif completed and not self._progress['queries']:
+                for path in (self.checkpoint_file, self.seen_file):
+                    if os.path.exists(path):
+                        os.remove(path)
+            else:
+                self.save_checkpoint()
+                logging.info(f"Checkpoint saved to '{self.checkpoint_file}'. Run again with resume=True to continue.")
+            if self.metrics_file:
+                self._metrics_stop.set()
+                self.metrics.export(self.metrics_file)
+                logging.info("Metrics written to '%s'.", self.metrics_file)
             logging.info(f"Job listings saved to '{self.output_file}'.")
 
-if __name__ == '__main__':
-    print("\n" + "=" * 80)
-    print("🔍 FOUNDIT.IN JOB SCRAPER 🔍".center(80))
-    print("=" * 80 + "\n")
-    
-    # Get current directory to show file location
-    current_dir = os.getcwd()
-    output_file = os.path.join(current_dir, 'foundit.csv')
-    
-    job_titles = ['Full Stack Developer']
-    job_locations = ['Pune']
-    
-    print(f"🔎 Searching for: {', '.join(job_titles)}")
-    print(f"📍 Locations: {', '.join(job_locations)}")
-    print(f"💾 Output file: {output_file}\n")
-    
-    scraper = FounditJob(job_titles, job_locations, output_file=output_file)
-    
-    print("🚀 Starting scraper...\n")
-    scraper.scrape()
-    
-    # Verify file was created
-    if os.path.exists(output_file):
-        print(f"\n✅ CSV file exists at: {output_file}")
-        file_size = os.path.getsize(output_file)
-        print(f"File size: {file_size} bytes")
-        
-        # Try to read and count rows
+def load_config(path):
+    """Read a TOML or YAML scrape config into a dict"""
+    if path.endswith(('.yaml', '.yml')):
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                line_count = sum(1 for _ in f)
-            print(f"Lines in CSV: {line_count} (including header)")
-        except Exception as e:
-            print(f"Error reading CSV file: {e}")
-    else:
-        print(f"\n❌ CSV file doesn't exist at: {output_file}")
-        
-        # Check if backup file exists
-        backup_file = os.path.join(current_dir, 'foundit_backup.csv')
-        if os.path.exists(backup_file):
-            print(f"✅ Backup CSV file exists at: {backup_file}")
-            file_size = os.path.getsize(backup_file)
-            print(f"Backup file size: {file_size} bytes")
-    
-    print("\n" + "=" * 80)
-    print("✅ SCRAPING COMPLETED ✅".center(80))
-    print("=" * 80)
\ No newline at end of file
+            import yaml
+        except ImportError:
+            raise ImportError("YAML configs need PyYAML: pip install pyyaml")
+        with open(path, encoding='utf-8') as file:
+            return yaml.safe_load(file) or {}
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+    with open(path, 'rb') as file:
+        return tomllib.load(file)
+
+def scraper_options(config):
+    """Split a config into titles, locations and FounditJob keyword arguments, rejecting unknown keys"""
+    import inspect
+
+    options = dict(config)
+    titles = options.pop('titles', None)
+    locations = options.pop('locations', None)
+    accepted = set(inspect.signature(FounditJob.__init__).parameters) - {'self', 'job_titles', 'job_locations'}
+    unknown = sorted(set(options) - accepted)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(unknown)}")
+    return titles, locations, options
+
+def csv_stats(path, top=5):
+    """Row, link, company and salary counts of a scraped CSV, read in one streaming pass"""
+    from collections import Counter
+
+    # Descriptions can be longer than the csv module's default field limit
+    csv.field_size_limit(2 ** 31 - 1)
+    rows = 0
+    with_salary = 0
+    links = set()
+    companies = Counter()
+    titles = Counter()
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for record in reader:
+            if len(record) < len(CSV_HEADER):
+                continue
+            rows += 1
+            links.add(record[3])
+            companies[record[1]] += 1
+            titles[record[0]] += 1
+            if record[2] != "Not available":
+                with_salary += 1
+    return {
+        'rows': rows,
+        'unique_links': len(links),
+        'companies': len(companies),
+        'with_salary': with_salary,
+        'top_companies': companies.most_common(top),
+        'top_titles': titles.most_common(top),
+    }
+
+def command_scrape(args):
+    try:
+        titles, locations, options = scraper_options(load_config(args.config) if args.config else {})
+    except (OSError, ValueError) as e:
+        # Missing or malformed config files, and unknown keys in them
+        args.parser.error(f"config {args.config}: {e}")
+    titles = args.title or titles or ['Full Stack Developer']
+    locations = args.location or locations or ['Pune']
+    overrides = {
+        'output_file': args.output,
+        'max_pages': args.max_pages,
+        'max_jobs': args.max_jobs,
+        'workers': args.workers,
+        'backend': args.backend,
+        'headless': args.headless or None,
+        'resume': args.resume or None,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    logging.info("Scraping %d titles x %d locations", len(titles), len(locations))
+    FounditJob(titles, locations, **options).scrape()
+    return 0
+
+def command_stats(args):
+    if args.queue and not os.path.exists(args.queue):
+        # Opening a TaskQueue would create an empty one at a mistyped path
+        args.parser.error(f"no work queue at {args.queue}")
+    stats = csv_stats(args.csv_file, args.top)
+    share = 100.0 * stats['with_salary'] / stats['rows'] if stats['rows'] else 0.0
+    print(f"Rows:          {stats['rows']}")
+    print(f"Unique links:  {stats['unique_links']}")
+    print(f"Companies:     {stats['companies']}")
+    print(f"With salary:   {stats['with_salary']} ({share:.1f}%)")
+    for label, key in (('Top companies', 'top_companies'), ('Top titles', 'top_titles')):
+        print(f"{label}:")
+        for name, count in stats[key]:
+            print(f"  {count:>7}  {name}")
+    if args.queue:
+        print(f"Task queue:    {TaskQueue(args.queue).counts()}")
+    return 0
+
+def command_export(args):
+    normalize_csv(args.input, args.output, args.chunk_mb)
+    return 0
+
+def command_dedup(args):
+    dedup_csv(args.input, args.output, args.threshold, args.duplicates)
+    return 0
+
+def command_reextract(args):
+    reextract(args.archive_dir, args.output_file, args.processes)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='FounditJob_main.py', description='Foundit.in job scraper')
+    commands = parser.add_subparsers(dest='command')
+
+    scrape = commands.add_parser('scrape', help='scrape job listings (the default)')
+    scrape.add_argument('--config', help='TOML or YAML file with titles, locations and FounditJob options')
+    scrape.add_argument('-t', '--title', action='append', help='job title to search for (repeatable)')
+    scrape.add_argument('-l', '--location', action='append', help='location to search in (repeatable)')
+    scrape.add_argument('-o', '--output', help='output CSV file')
+    scrape.add_argument('--max-pages', type=int, help='results pages per query; 0 for no limit (the default)')
+    scrape.add_argument('--max-jobs', type=int)
+    scrape.add_argument('--workers', type=int)
+    scrape.add_argument('--backend', choices=['selenium', 'http'])
+    scrape.add_argument('--headless', action='store_true')
+    scrape.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    scrape.set_defaults(handler=command_scrape, parser=scrape)
+
+    stats = commands.add_parser('stats', help='summarize a scraped CSV')
+    stats.add_argument('csv_file')
+    stats.add_argument('--top', type=int, default=5, help='how many top companies and titles to list')
+    stats.add_argument('--queue', help='also show task counts from this work queue file')
+    stats.set_defaults(handler=command_stats, parser=stats)
+
+    export = commands.add_parser('export', help='write a CSV with typed salary, More Info and skills columns')
+    export.add_argument('input')
+    export.add_argument('output', help='.parquet for Parquet, anything else for CSV')
+    export.add_argument('--chunk-mb', type=int, default=16)
+    export.set_defaults(handler=command_export)
+
+    dedup = commands.add_parser('dedup', help='drop near-duplicate reposts from a CSV')
+    dedup.add_argument('input')
+    dedup.add_argument('output')
+    dedup.add_argument('--threshold', type=float, default=0.8, help='estimated Jaccard similarity to count as a repost')
+    dedup.add_argument('--duplicates', help='also write (link, duplicate of) pairs to this CSV')
+    dedup.set_defaults(handler=command_dedup)
+
+    reextract_command = commands.add_parser('reextract', help='re-extract job details from an HTML archive')
+    reextract_command.add_argument('archive_dir')
+    reextract_command.add_argument('output_file')
+    reextract_command.add_argument('--processes', type=int, default=None, help='worker processes (default: all cores)')
+    reextract_command.set_defaults(handler=command_reextract)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(['scrape'])
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Offline throughput benchmark for FounditJob against the saved pages in fixtures/.
+
+Runs the scraper end to end in headless mode against a local FixtureServer and
+reports jobs/minute, p50/p95 seconds per job, WebDriver commands per job and peak
+RSS of the scraper plus its browser processes. Every run is saved as JSON so that
+two runs can be compared:
+
+    python bench_scraper.py --label before --latency 0.2
+    python bench_scraper.py --label after --latency 0.2 --direct-links
+    python bench_scraper.py --compare results/before-*.json results/after-*.json
+
+--profile lean measures the fast-start driver profile (cached chromedriver, headless,
+blocked images/fonts/media); fixture_bytes shows what the browser downloaded.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from time import monotonic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FounditJob_main import FounditJob
+from fixture_server import FixtureServer
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Metrics shown by --compare, and whether a higher value is better
+COMPARED_METRICS = [
+    ('jobs_per_minute', True),
+    ('p50_job_seconds', False),
+    ('p95_job_seconds', False),
+    ('webdriver_commands_per_job', False),
+    ('peak_rss_mb', False),
+    ('driver_start_seconds', False),
+    ('fixture_bytes_per_page', False),
+]
+
+
+class TimedFounditJob(FounditJob):
+    """FounditJob that timestamps every saved record"""
+    def __init__(self, *args, **kwargs):
+        self.saved_at = []
+        super().__init__(*args, **kwargs)
+
+    def save_record_to_csv(self, record):
+        self.saved_at.append(monotonic())
+        return super().save_record_to_csv(record)
+
+
+class PeakRssSampler:
+    """Samples the RSS of this process and all of its children (Chrome, chromedriver)"""
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            import psutil
+        except ImportError:
+            return
+        process = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for proc in [process] + process.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_bytes = max(self.peak_bytes, total)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        if not self.peak_bytes:
+            # Without psutil only the largest single process is known (ru_maxrss is in KiB on Linux)
+            usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+            self.peak_bytes = usage * 1024
+        return self.peak_bytes
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_benchmark(args):
+    server = FixtureServer(latency=args.latency).start()
+    sampler = PeakRssSampler().start()
+    output_file = os.path.join(tempfile.mkdtemp(prefix='foundit-bench-'), 'bench.csv')
+    try:
+        started = monotonic()
+        scraper = TimedFounditJob(
+            ['Full Stack Developer'], ['Pune'],
+            output_file=output_file,
+            base_url=server.base_url,
+            headless=True,
+            profile=args.profile,
+            backend=args.backend,
+            workers=args.workers,
+            direct_links=args.direct_links,
+            js_extraction=not args.element_extraction,
+            max_pages=None,
+            requests_per_second=args.requests_per_second
+        )
+        if args.backend == 'selenium' and args.workers == 1:
+            # The driver starts lazily; start it here so its start-up is timed on its own
+            scraper.driver
+        driver_ready = monotonic()
+        scrape_started = monotonic()
+        scraper.scrape()
+        finished = monotonic()
+    finally:
+        peak_rss = sampler.stop()
+        server.stop()
+
+    job_times = []
+    previous = scrape_started
+    for saved_at in scraper.saved_at:
+        job_times.append(saved_at - previous)
+        previous = saved_at
+
+    jobs = len(scraper.saved_at)
+    stages = scraper.metrics.snapshot()['stages']
+    pages_loaded = sum(stages.get(stage, {}).get('count', 0)
+                       for stage in ('search_page_load', 'navigate', 'http_fetch'))
+    elapsed = finished - started
+    return {
+        'label': args.label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'backend': args.backend,
+            'profile': args.profile,
+            'workers': args.workers,
+            'direct_links': args.direct_links,
+            'js_extraction': not args.element_extraction,
+            'latency': args.latency,
+            'requests_per_second': args.requests_per_second,
+        },
+        'jobs': jobs,
+        'elapsed_seconds': round(elapsed, 3),
+        'driver_start_seconds': round(driver_ready - started, 3),
+        'jobs_per_minute': round(jobs / elapsed * 60, 2) if elapsed else None,
+        'p50_job_seconds': round(percentile(job_times, 0.50), 3) if job_times else None,
+        'p95_job_seconds': round(percentile(job_times, 0.95), 3) if job_times else None,
+        'webdriver_commands_per_job': round(scraper.webdriver_commands / jobs, 1) if jobs else None,
+        'peak_rss_mb': round(peak_rss / (1024 * 1024), 1),
+        'fixture_requests': server.requests_served,
+        'fixture_bytes': server.bytes_served,
+        'fixture_bytes_per_page': round(server.bytes_served / pages_loaded) if pages_loaded else None,
+    }
+
+
+def save_result(result):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(RESULTS_DIR, f"{result['label']}-{stamp}.json")
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(result, file, indent=2)
+    return path
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding='utf-8') as file:
+        old = json.load(file)
+    with open(new_path, encoding='utf-8') as file:
+        new = json.load(file)
+
+    print(f"{'metric':<28}{old['label']:>14}{new['label']:>14}{'change':>10}")
+    for metric, higher_is_better in COMPARED_METRICS:
+        before, after = old.get(metric), new.get(metric)
+        if before is None or after is None:
+            print(f"{metric:<28}{str(before):>14}{str(after):>14}{'n/a':>10}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        marker = '+' if better else '-' if change else ' '
+        print(f"{metric:<28}{before:>14}{after:>14}{change:>9.1f}%{marker}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark FounditJob against recorded Foundit pages')
+    parser.add_argument('--label', default='run', help='name stored with the results')
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds the fixture server adds per response')
+    parser.add_argument('--backend', choices=['selenium', 'http'], default='selenium')
+    parser.add_argument('--profile', choices=['default', 'lean'], default='default')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--direct-links', action='store_true')
+    parser.add_argument('--element-extraction', action='store_true', help='use per-element lookups instead of JS')
+    parser.add_argument('--requests-per-second', type=float, default=None)
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two saved result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+
+    result = run_benchmark(args)
+    path = save_result(result)
+    print(json.dumps(result, indent=2))
+    print(f"\nResults saved to {path}")
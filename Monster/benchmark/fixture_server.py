@@ -0,0 +1,141 @@
+"""Local HTTP server that replays saved Foundit pages for offline benchmarking.
+
+    python fixture_server.py --port 8765 --latency 0.2
+
+Search URLs (/srp/results?...&start=N) are answered from fixtures/search/page_<n>.html,
+with start divided by the number of cards per page; offsets past the last page get
+fixtures/search/empty.html. /static/ paths are served from fixtures/static/, except
+images and fonts, which get a synthetic payload of realistic size so that the bytes a
+browser profile downloads can be measured. Any other path is looked up by its last
+segment in fixtures/jobs/<slug>.html.
+"""
+import argparse
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Synthetic heavy resources: extension -> (content type, size in bytes)
+BINARY_ASSETS = {
+    '.png': ('image/png', 24 * 1024),
+    '.jpg': ('image/jpeg', 180 * 1024),
+    '.woff2': ('font/woff2', 60 * 1024),
+}
+TEXT_TYPES = {'.css': 'text/css', '.js': 'application/javascript', '.html': 'text/html'}
+
+
+class FixtureServer:
+    def __init__(self, fixtures_dir=FIXTURES_DIR, host='127.0.0.1', port=0, latency=0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.requests_served = 0
+        self.bytes_served = 0
+        self.search_pages = self.load_search_pages()
+        self.cards_per_page = len(re.findall(r'class="srpResultCardContainer"', self.search_pages[0])) \
+            if self.search_pages else 1
+        self.httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def load_search_pages(self):
+        pages = []
+        while True:
+            path = os.path.join(self.fixtures_dir, 'search', f'page_{len(pages) + 1}.html')
+            if not os.path.exists(path):
+                return pages
+            with open(path, encoding='utf-8') as file:
+                pages.append(file.read())
+
+    def read_fixture(self, *parts):
+        path = os.path.join(self.fixtures_dir, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def resolve(self, url_path):
+        """(body bytes, content type) for a request path, or None for a 404"""
+        parts = urlsplit(url_path)
+        if parts.path.rstrip('/') == '/srp/results':
+            start = int(parse_qs(parts.query).get('start', ['0'])[0])
+            page = start // self.cards_per_page
+            if page < len(self.search_pages):
+                body = self.search_pages[page]
+            else:
+                body = self.read_fixture('search', 'empty.html')
+            return body.encode('utf-8'), 'text/html; charset=utf-8'
+
+        if parts.path.startswith('/static/'):
+            extension = os.path.splitext(parts.path)[1]
+            if extension in BINARY_ASSETS:
+                content_type, size = BINARY_ASSETS[extension]
+                return b'\0' * size, content_type
+            body = self.read_fixture('static', os.path.basename(parts.path))
+            if body is None or extension not in TEXT_TYPES:
+                return None
+            return body.encode('utf-8'), TEXT_TYPES[extension]
+
+        slug = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        if not slug or '.' in slug:
+            return None
+        body = self.read_fixture('jobs', f'{slug}.html')
+        return (body.encode('utf-8'), 'text/html; charset=utf-8') if body is not None else None
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if server.latency:
+                    sleep(server.latency)
+                server.requests_served += 1
+                resolved = server.resolve(self.path)
+                if resolved is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                data, content_type = resolved
+                server.bytes_served += len(data)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve saved Foundit pages for offline runs')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency=args.latency)
+    print(f"Serving {len(server.search_pages)} search pages from {server.fixtures_dir} at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,4 @@
+(function () {
+  window.dataLayer = window.dataLayer || [];
+  window.dataLayer.push({event: 'jd_view', ts: Date.now()});
+})();
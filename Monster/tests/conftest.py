@@ -0,0 +1,8 @@
+import os
+import sys
+
+MONSTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scraper is a single module, and the fixture server lives with the benchmark
+sys.path.insert(0, MONSTER_DIR)
+sys.path.insert(0, os.path.join(MONSTER_DIR, 'benchmark'))
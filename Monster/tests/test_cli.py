@@ -0,0 +1,105 @@
+"""Config handling and subcommands of the command line entry point"""
+import csv
+import functools
+
+import pytest
+
+import FounditJob_main
+from FounditJob_main import CSV_HEADER, FounditJob, main, scraper_options
+
+
+class RecordingScraper:
+    """Stands in for FounditJob, keeping the arguments of every run"""
+    runs = []
+
+    # scraper_options checks config keys against this signature
+    @functools.wraps(FounditJob.__init__)
+    def __init__(self, job_titles, job_locations, **options):
+        self.run = (job_titles, job_locations, options)
+
+    def scrape(self):
+        self.runs.append(self.run)
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    monkeypatch.setattr(FounditJob_main, 'FounditJob', RecordingScraper)
+    RecordingScraper.runs = []
+    return RecordingScraper.runs
+
+
+@pytest.fixture
+def toml():
+    try:
+        import tomllib
+    except ImportError:
+        pytest.importorskip('tomli')
+
+
+def test_scraper_options_splits_queries_from_scraper_arguments():
+    titles, locations, options = scraper_options({'titles': ['Developer'], 'locations': ['Pune', 'Delhi'],
+                                                  'max_pages': 2, 'backend': 'http'})
+    assert (titles, locations) == (['Developer'], ['Pune', 'Delhi'])
+    assert options == {'max_pages': 2, 'backend': 'http'}
+
+    with pytest.raises(ValueError, match='max_page, output'):
+        scraper_options({'output': 'jobs.csv', 'max_page': 2})
+
+
+def test_scrape_reads_the_config_and_lets_flags_override_it(tmp_path, runs, toml):
+    config = tmp_path / 'scrape.toml'
+    config.write_text('titles = ["Developer"]\nlocations = ["Pune"]\nmax_pages = 2\nworkers = 3\n')
+
+    assert main(['scrape', '--config', str(config), '-l', 'Delhi', '-l', 'Goa', '--max-pages', '5',
+                 '-o', str(tmp_path / 'jobs.csv')]) == 0
+    assert runs == [(['Developer'], ['Delhi', 'Goa'],
+                     {'max_pages': 5, 'workers': 3, 'output_file': str(tmp_path / 'jobs.csv')})]
+
+
+def test_no_arguments_scrape_the_default_query(runs):
+    assert main([]) == 0
+    assert runs == [(['Full Stack Developer'], ['Pune'], {})]
+
+
+@pytest.mark.parametrize('config_text', ['max_page = 2\n', 'titles = [\n'])
+def test_a_bad_config_is_a_usage_error(tmp_path, runs, toml, capsys, config_text):
+    config = tmp_path / 'scrape.toml'
+    config.write_text(config_text)
+    with pytest.raises(SystemExit) as exit_info:
+        main(['scrape', '--config', str(config)])
+    assert exit_info.value.code == 2
+    assert f'config {config}' in capsys.readouterr().err
+    assert runs == []
+
+
+def test_a_missing_config_is_a_usage_error(tmp_path, runs):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['scrape', '--config', str(tmp_path / 'missing.toml')])
+    assert exit_info.value.code == 2
+
+
+def test_stats_summarizes_a_csv(tmp_path, capsys):
+    path = tmp_path / 'jobs.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for i, (company, salary) in enumerate([('Acme', 'INR 8 - 14 LPA'), ('Acme', 'Not available'),
+                                               ('Globex', 'Not available')]):
+            writer.writerow(['Developer', company, salary, f'https://www.foundit.in/job/dev-{i}', 'Build things',
+                             'Not available', 'Python', 'Not available'])
+
+    assert main(['stats', str(path), '--top', '1']) == 0
+    out = capsys.readouterr().out
+    assert 'Rows:          3' in out
+    assert 'With salary:   1 (33.3%)' in out
+    assert '        2  Acme' in out
+    assert 'Globex' not in out
+
+
+def test_stats_rejects_a_missing_queue_file(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text(','.join(CSV_HEADER) + '\n')
+    with pytest.raises(SystemExit) as exit_info:
+        main(['stats', str(path), '--queue', str(tmp_path / 'missing.db')])
+    assert exit_info.value.code == 2
+    assert not (tmp_path / 'missing.db').exists()
@@ -0,0 +1,70 @@
+"""Writing and appending to the CSV output"""
+import csv
+
+from FounditJob_main import CSV_HEADER, CsvSink
+
+
+def row(i):
+    return ['Developer', 'Acme', 'Not available', f'https://www.foundit.in/job/dev-{i}', 'Build things',
+            'Not available', 'Python', 'Not available']
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+def write_rows(path, rows, **kwargs):
+    sink = CsvSink(str(path), CSV_HEADER, **kwargs)
+    try:
+        for i in rows:
+            sink.write(row(i))
+    finally:
+        sink.close()
+    return sink
+
+
+def test_a_new_file_gets_the_header_and_every_row(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    sink = write_rows(path, range(3), batch_size=2)
+
+    assert read_rows(path) == [CSV_HEADER] + [row(i) for i in range(3)]
+    assert sink.rows_written == 3
+
+
+def test_append_continues_the_file_without_a_second_header(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    write_rows(path, range(2))
+    write_rows(path, range(2, 4), append=True)
+
+    assert read_rows(path) == [CSV_HEADER] + [row(i) for i in range(4)]
+
+
+def test_append_to_a_missing_or_empty_file_writes_the_header(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    write_rows(path, range(1), append=True)
+    assert read_rows(path) == [CSV_HEADER, row(0)]
+
+    path.write_text('')
+    write_rows(path, range(1), append=True)
+    assert read_rows(path) == [CSV_HEADER, row(0)]
+
+
+def test_without_append_the_file_is_replaced(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    write_rows(path, range(3))
+    write_rows(path, range(5, 6))
+
+    assert read_rows(path) == [CSV_HEADER, row(5)]
+
+
+def test_checkpoint_makes_queued_rows_readable(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    sink = CsvSink(str(path), CSV_HEADER, batch_size=100, flush_interval=60)
+    try:
+        sink.write(row(0))
+        sink.checkpoint()
+        assert read_rows(path) == [CSV_HEADER, row(0)]
+    finally:
+        sink.close()
+
@@ -0,0 +1,78 @@
+"""Job keys and near-duplicate detection"""
+import csv
+
+from FounditJob_main import CSV_HEADER, FounditJob, NearDuplicateIndex, dedup_csv, job_dedup_key, parse_job_id
+
+DESCRIPTION = ("We are looking for a Full Stack Developer to build and maintain web applications "
+               "with React and Node.js, design REST APIs, write tests and review code with the team. ")
+
+
+def test_parse_job_id_reads_the_path_or_the_query():
+    assert parse_job_id('https://www.foundit.in/job/full-stack-developer-acme-pune-34567890') == '34567890'
+    assert parse_job_id('https://www.foundit.in/job/full-stack-developer-acme-pune-34567890/') == '34567890'
+    assert parse_job_id('https://www.foundit.in/seeker/job-details?jobId=4242') == '4242'
+    assert parse_job_id('https://www.foundit.in/job/full-stack-developer-acme-pune') is None
+    assert parse_job_id(None) is None
+
+
+def test_job_dedup_key_prefers_the_job_id():
+    link = 'https://www.foundit.in/job/full-stack-developer-acme-pune-34567890?src=srp'
+    assert job_dedup_key('Full Stack Developer', 'Acme', link) == 'id:34567890'
+    assert job_dedup_key('Full Stack Developer', 'Acme', None) == 'Full Stack Developer_Acme'
+
+
+def test_near_duplicate_index_clusters_reposts():
+    index = NearDuplicateIndex(threshold=0.8)
+    assert index.add('job/1', DESCRIPTION * 3) is None
+    # A repost with one word changed
+    assert index.add('job/2', DESCRIPTION.replace('maintain', 'support') + DESCRIPTION * 2) == 'job/1'
+    assert index.add('job/3', "Hiring a data engineer for Spark and Airflow pipelines on AWS, "
+                              "owning ingestion, modelling and data quality checks.") is None
+    assert (index.records, index.duplicates) == (3, 1)
+
+
+def test_near_duplicate_index_ignores_records_without_text():
+    index = NearDuplicateIndex()
+    record = ['Developer', 'Acme', 'Not available', 'https://www.foundit.in/job/dev-1', 'Not available',
+              'Not available', 'Not available', 'Not available']
+    assert index.add_record(record) is None
+    assert index.add_record(record) is None
+    assert index.records == 0
+
+
+def test_dedup_csv_reads_descriptions_past_the_csv_field_limit(tmp_path):
+    source = tmp_path / 'jobs.csv'
+    description = DESCRIPTION * 1000
+    # The limit is process-wide, so put back the csv module's default of 128 KiB first
+    csv.field_size_limit(128 * 1024)
+    assert len(description) > csv.field_size_limit()
+    with open(source, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for i in range(2):
+            writer.writerow(['Developer', 'Acme', 'Not available', f'https://www.foundit.in/job/dev-{i}',
+                             description, 'Not available', 'Python', 'Not available'])
+
+    assert dedup_csv(str(source), str(tmp_path / 'unique.csv')) == (2, 1)
+    index = NearDuplicateIndex()
+    index.load_csv(str(source))
+    assert index.records == 2
+
+
+def test_saved_jobs_enter_the_index_after_their_rows_are_checkpointed(tmp_path):
+    scraper = FounditJob(['Developer'], ['Pune'], output_file=str(tmp_path / 'jobs.csv'),
+                         index_file=str(tmp_path / 'jobs.index.db'))
+    try:
+        assert scraper.claim_job('id:123')
+        scraper.release_job('id:123', saved=True)
+        scraper.release_job('id:123')
+        assert not scraper.job_index.seen('id:123')
+        # The claim holds until then, so no other process can take the job
+        assert not scraper.job_index.claim('id:123', 'other-host')
+
+        scraper.checkpoint_outputs()
+        assert scraper.job_index.seen('id:123')
+        assert scraper.is_known_job('id:123')
+    finally:
+        scraper.sink.close()
+        scraper.job_index.close()
@@ -0,0 +1,53 @@
+"""Expiry, eviction and hit accounting in the on-disk detail cache"""
+import pytest
+
+from FounditJob_main import DetailCache
+
+DETAILS = {'job_description': 'Build things ' * 10, 'skills': 'Python'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DetailCache(str(tmp_path / 'cache.db'), ttl_seconds=60)
+    yield cache
+    cache.close()
+
+
+def test_a_stored_page_is_served_under_its_canonical_url(cache):
+    assert cache.get('https://www.foundit.in/job/dev-34567801') is None
+    cache.put('https://www.foundit.in/job/dev-34567801', DETAILS, fetch_seconds=1.5)
+
+    assert cache.get('https://www.foundit.in/job/dev-34567801/?src=srp#top') == DETAILS
+    assert (cache.hits, cache.misses, cache.saved_seconds) == (1, 1, 1.5)
+
+
+def test_an_expired_entry_is_a_miss_until_it_is_stored_again(cache):
+    url = 'https://www.foundit.in/job/dev-34567801'
+    cache.put(url, DETAILS)
+    cache._conn.execute("UPDATE pages SET created_at = created_at - 120")
+
+    assert cache.get(url) is None
+    cache.put(url, dict(DETAILS, skills='Python, SQL'))
+    assert cache.get(url)['skills'] == 'Python, SQL'
+
+
+def test_the_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path):
+    cache = DetailCache(str(tmp_path / 'cache.db'), max_bytes=700)
+    try:
+        urls = [f'https://www.foundit.in/job/dev-{i}' for i in range(5)]
+        for url in urls[:3]:
+            cache.put(url, DETAILS)
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get(urls[0]) is not None
+        for url in urls[3:]:
+            cache.put(url, DETAILS)
+        # Four entries fit in max_bytes, the fifth sends the cache down to 90% of it
+
+        assert cache.get(urls[0]) is not None
+        assert cache.get(urls[1]) is None
+        assert cache.get(urls[2]) is None
+        assert cache.get(urls[3]) is not None
+        assert cache.get(urls[4]) is not None
+        assert cache._size <= cache.max_bytes
+    finally:
+        cache.close()
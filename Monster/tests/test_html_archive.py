@@ -0,0 +1,45 @@
+"""Archiving raw detail pages and re-extracting records from them offline"""
+import csv
+import os
+
+import pytest
+
+pytest.importorskip('lxml')
+
+from FounditJob_main import CSV_HEADER, HtmlArchive, reextract
+from fixture_server import FIXTURES_DIR
+
+BASE_URL = 'https://www.foundit.in/job/'
+SLUGS = ['full-stack-developer-acme-pune-34567801', 'senior-full-stack-engineer-bluepeak-pune-34567802',
+         'mern-stack-developer-codecraft-pune-34567803']
+
+
+def read_page(slug):
+    with open(os.path.join(FIXTURES_DIR, 'jobs', f'{slug}.html'), encoding='utf-8') as file:
+        return file.read()
+
+
+def test_reextract_reads_the_newest_copy_of_each_archived_page(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    # A segment size of 0 puts every page in a segment of its own
+    archive = HtmlArchive(archive_dir, segment_mb=0)
+    for slug in SLUGS:
+        archive.add(BASE_URL + slug, read_page(slug), 'Full Stack Developer', 'Acme')
+    archive.add(BASE_URL + SLUGS[0], read_page(SLUGS[0]).replace('INR 8 - 14 LPA', 'INR 9 - 15 LPA'),
+                'Full Stack Developer', 'Acme')
+    # Rendered client-side, so nothing can be extracted from it
+    archive.add(BASE_URL + 'client-rendered-1', '<html><body><div id="root"></div></body></html>')
+    archive.close()
+    assert archive.pages_written == 5
+    assert len([name for name in os.listdir(archive_dir) if name.endswith('.z')]) == 5
+
+    output_file = str(tmp_path / 'reextracted.csv')
+    assert reextract(archive_dir, output_file, processes=2, batch_size=1) == (4, 3)
+
+    with open(output_file, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == CSV_HEADER
+    records = {record[3]: record for record in rows[1:]}
+    assert sorted(records) == sorted(BASE_URL + slug for slug in SLUGS)
+    assert records[BASE_URL + SLUGS[0]][:3] == ['Full Stack Developer', 'Acme', 'INR 9 - 15 LPA']
+    assert records[BASE_URL + SLUGS[0]][6] == 'React, Node.js, MongoDB'
@@ -0,0 +1,131 @@
+"""The browserless backend against the saved pages served by FixtureServer"""
+import csv
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('lxml')
+
+from FounditJob_main import CSV_HEADER, FounditJob, parse_job_details
+from fixture_server import FixtureServer
+
+
+@pytest.fixture
+def server():
+    server = FixtureServer().start()
+    yield server
+    server.stop()
+
+
+class FlakyServer(FixtureServer):
+    """Answers 404 for the second search page until it is fixed"""
+    broken = True
+
+    def resolve(self, url_path):
+        if self.broken and url_path.startswith('/srp/results') and f'start={self.cards_per_page}' in url_path:
+            return None
+        return super().resolve(url_path)
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+def make_scraper(server, tmp_path, **kwargs):
+    return FounditJob(['Full Stack Developer'], ['Pune'], output_file=str(tmp_path / 'jobs.csv'),
+                      base_url=server.base_url, backend='http', max_pages=None, requests_per_second=None,
+                      **kwargs)
+
+
+def test_http_backend_writes_every_server_rendered_job(server, tmp_path, monkeypatch):
+    browser_calls = []
+    # There is no Chrome here; the one popup-only fixture page is left to the browser
+    monkeypatch.setattr(FounditJob, 'run_in_browser', lambda self, method, *args: browser_calls.append(args) or 0)
+    scraper = make_scraper(server, tmp_path)
+    scraper.scrape()
+
+    rows = read_rows(tmp_path / 'jobs.csv')
+    assert rows[0] == CSV_HEADER
+    records = rows[1:]
+    assert len(records) == 9
+    assert len({record[3] for record in records}) == 9
+    assert all(record[3].startswith(server.base_url + '/job/') for record in records)
+    assert len(browser_calls) == 1
+
+    # Details are fetched concurrently, so rows arrive in completion order
+    first = next(record for record in records if record[3].endswith('-34567801'))
+    assert first[:3] == ['Full Stack Developer', 'Acme Technologies', 'INR 8 - 14 LPA']
+    assert first[5].startswith('Role:Full Stack Developer\n')
+    assert first[6] == 'React, Node.js, MongoDB'
+    assert scraper._progress['completed'] == ['Full Stack Developer|Pune']
+
+
+def test_http_backend_skips_jobs_already_in_the_index(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(FounditJob, 'run_in_browser', lambda self, method, *args: 0)
+    index_file = str(tmp_path / 'jobs.index.db')
+    make_scraper(server, tmp_path, index_file=index_file).scrape()
+    requests_first_run = server.requests_served
+
+    make_scraper(server, tmp_path, index_file=index_file, append=True).scrape()
+
+    assert len(read_rows(tmp_path / 'jobs.csv')) == 1 + 9
+    # Only the first search page is fetched: every job on it is known
+    assert server.requests_served - requests_first_run == 1
+
+
+def test_parse_search_page_resolves_card_links(server, tmp_path):
+    scraper = make_scraper(server, tmp_path)
+    page_url = scraper.generate_url('Full Stack Developer', 'Pune', 0)
+    html = server.search_pages[0]
+    cards = scraper.parse_search_page(html, page_url)
+
+    assert len(cards) == server.cards_per_page
+    assert [card['index'] for card in cards] == list(range(len(cards)))
+    assert cards[0]['title'] == 'Full Stack Developer'
+    assert cards[0]['company'] == 'Acme Technologies'
+    assert cards[0]['href'] == server.base_url + '/job/full-stack-developer-acme-pune-34567801'
+
+
+def test_parse_job_details_reads_fields_and_rejects_client_rendered_pages(server):
+    details = parse_job_details(server.read_fixture('jobs', 'full-stack-developer-acme-pune-34567801.html'))
+    assert details['salary'] == 'INR 8 - 14 LPA'
+    assert details['skills'] == 'React, Node.js, MongoDB'
+    assert details['job_description'].startswith('We are looking for a Full Stack Developer')
+
+    assert parse_job_details('<html><body><div id="root"></div></body></html>') is None
+
+
+def test_a_resumed_run_crawls_past_the_page_it_stopped_on(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(FounditJob, 'run_in_browser', lambda self, method, *args: 0)
+    jobs = make_scraper(server, tmp_path, stream_buffer=1).iter_jobs()
+    # Stop part-way through the first page, so its jobs are known when the run resumes
+    next(jobs)
+    next(jobs)
+    jobs.close()
+
+    scraper = make_scraper(server, tmp_path, resume=True, stream_buffer=1)
+    scraper.scrape()
+
+    records = read_rows(tmp_path / 'jobs.csv')[1:]
+    assert len({record[3] for record in records}) == len(records) == 9
+    assert scraper._progress['completed'] == ['Full Stack Developer|Pune']
+
+
+def test_a_page_that_cannot_be_fetched_leaves_the_query_unfinished(tmp_path, monkeypatch):
+    monkeypatch.setattr(FounditJob, 'run_in_browser', lambda self, method, *args: 0)
+    server = FlakyServer().start()
+    try:
+        scraper = make_scraper(server, tmp_path)
+        scraper.scrape()
+        assert scraper._progress['completed'] == []
+        assert scraper._progress['queries']['Full Stack Developer|Pune']['page'] == 2
+        assert len(read_rows(tmp_path / 'jobs.csv')) == 1 + server.cards_per_page
+
+        server.broken = False
+        scraper = make_scraper(server, tmp_path, resume=True)
+        scraper.scrape()
+        assert scraper._progress['completed'] == ['Full Stack Developer|Pune']
+        assert len(read_rows(tmp_path / 'jobs.csv')) == 1 + 9
+    finally:
+        server.stop()
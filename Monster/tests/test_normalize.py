@@ -0,0 +1,48 @@
+"""Typed salary, More Info and skills columns from normalize_batch"""
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from FounditJob_main import CSV_HEADER, normalize_batch
+
+
+def normalize(salaries, more_info="Not available", skills="Not available"):
+    rows = [['Developer', 'Acme', salary, 'https://www.foundit.in/job/dev-1', 'Build things', more_info, skills,
+             'Not available'] for salary in salaries]
+    batch = pa.RecordBatch.from_arrays([pa.array(column) for column in zip(*rows)], names=CSV_HEADER)
+    return normalize_batch(batch).to_pylist()
+
+
+def salary(row):
+    return row['Salary Min'], row['Salary Max'], row['Salary Currency'], row['Salary Period']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('INR 8 - 14 LPA', (800000, 1400000, 'INR', 'year')),
+    ('₹ 5,00,000 - 8,00,000 per annum', (500000, 800000, 'INR', 'year')),
+    ('USD 40,000 - 60,000 per month', (40000, 60000, 'USD', 'month')),
+    ('Rs. 25000 - 30000 p.m.', (25000, 30000, 'INR', 'month')),
+    ('8-14 LPA', (800000, 1400000, 'INR', 'year')),
+    ('1.5 Cr', (15000000, 15000000, 'INR', 'year')),
+    ('$ 50k - 70k', (50000, 70000, 'USD', None)),
+    ('40k-60k per month', (40000, 60000, None, 'month')),
+    ('INR 8L - 14L', (800000, 1400000, 'INR', 'year')),
+    ('2-5 Yrs INR 5 LPA', (500000, 500000, 'INR', 'year')),
+    ('3-6 years', (None, None, None, None)),
+    ('Not available', (None, None, None, None)),
+])
+def test_salary_ranges(text, expected):
+    assert salary(normalize([text])[0]) == expected
+
+
+def test_more_info_and_skills_columns():
+    row = normalize(['Not available'], more_info="Role:Full Stack Developer\nIndustry:IT/Computers - Software",
+                    skills="Python, SQL ,React")[0]
+    assert row['Role'] == 'Full Stack Developer'
+    assert row['Industry'] == 'IT/Computers - Software'
+    assert row['Function'] is None
+    assert row['Skills'] == ['python', 'sql', 'react']
+
+    missing = normalize(['Not available'], skills='')[0]
+    assert missing['Role'] is None
+    assert missing['Skills'] is None
@@ -0,0 +1,66 @@
+"""Staging, compaction and crash recovery in the Parquet dataset output"""
+import glob
+import os
+
+import pytest
+
+pytest.importorskip('pyarrow')
+import pyarrow.dataset as ds
+
+from FounditJob_main import ParquetSink
+
+
+def row(i):
+    return ['Developer', 'Acme', 'Not available', f'https://www.foundit.in/job/dev-{i}', 'Build things',
+            'Not available', 'Python', 'Not available']
+
+
+def parquet_files(path):
+    return glob.glob(os.path.join(path, 'run_date=*', 'query_location=*', '*.parquet'))
+
+
+def read_links(path):
+    return sorted(ds.dataset(path, partitioning='hive').to_table(columns=['Job Link'])['Job Link'].to_pylist())
+
+
+def test_checkpoints_stage_rows_and_close_writes_one_file_per_partition(tmp_path):
+    path = str(tmp_path / 'dataset')
+    sink = ParquetSink(path, batch_rows=100)
+    for i in range(10):
+        sink.write(row(i), 'Developer', 'Pune' if i % 2 else 'Delhi')
+        sink.checkpoint()
+    assert parquet_files(path) == []
+    assert os.path.getsize(sink.staging_file) > 0
+
+    sink.close()
+    assert len(parquet_files(path)) == 2
+    assert not os.path.exists(sink.staging_file)
+    assert sink.rows_written == 10
+    assert len(read_links(path)) == 10
+
+
+def test_a_full_batch_is_written_with_the_staged_rows(tmp_path):
+    path = str(tmp_path / 'dataset')
+    sink = ParquetSink(path, batch_rows=4)
+    for i in range(6):
+        sink.write(row(i), 'Developer', 'Pune')
+        sink.checkpoint()
+    assert len(parquet_files(path)) == 1
+    sink.close()
+    assert len(parquet_files(path)) == 2
+    assert len(read_links(path)) == 6
+
+
+def test_rows_staged_by_a_dead_run_are_recovered(tmp_path, monkeypatch):
+    path = str(tmp_path / 'dataset')
+    crashed = ParquetSink(path, batch_rows=100)
+    for i in range(3):
+        crashed.write(row(i), 'Developer', 'Pune')
+        crashed.checkpoint()
+    # This row was never checkpointed, so it is lost with the run
+    crashed.write(row(3), 'Developer', 'Pune')
+
+    monkeypatch.setattr('FounditJob_main.pid_alive', lambda pid: False)
+    ParquetSink(path, batch_rows=100).close()
+    assert not os.path.exists(crashed.staging_file)
+    assert read_links(path) == [f'https://www.foundit.in/job/dev-{i}' for i in range(3)]
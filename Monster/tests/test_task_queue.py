@@ -0,0 +1,81 @@
+"""Leasing, expiry and hand-back in the shared SQLite task queue"""
+import pytest
+
+from FounditJob_main import JobIndex, TaskQueue
+
+
+@pytest.fixture
+def tasks(tmp_path):
+    tasks = TaskQueue(str(tmp_path / 'queue.db'), max_attempts=2)
+    yield tasks
+    tasks.close()
+
+
+def test_a_task_is_leased_to_one_worker_at_a_time(tasks):
+    tasks.put('Developer', 'Pune')
+    tasks.put('Developer', 'Pune')
+
+    task = tasks.lease('w1')
+    assert (task['title'], task['location'], task['page'], task['start']) == ('Developer', 'Pune', 1, 0)
+    assert task['previous_worker'] is None
+    assert tasks.lease('w2') is None
+    assert tasks.counts() == {'leased': 1}
+
+
+def test_completing_a_task_queues_the_next_page(tasks):
+    tasks.put('Developer', 'Pune')
+    task = tasks.lease('w1')
+    tasks.complete(task, 'w1', {'title': 'Developer', 'location': 'Pune', 'page': 2, 'start': 20, 'saved': 20})
+
+    next_task = tasks.lease('w1')
+    assert (next_task['page'], next_task['start'], next_task['saved']) == (2, 20, 20)
+    assert tasks.counts() == {'done': 1, 'leased': 1}
+
+
+def test_an_expired_lease_goes_back_to_another_worker(tasks):
+    tasks.put('Developer', 'Pune')
+    stale = tasks.lease('w1', lease_seconds=-1)
+
+    task = tasks.lease('w2')
+    assert task['page'] == stale['page']
+    assert task['previous_worker'] == 'w1'
+    # The stale worker no longer holds the lease
+    assert not tasks.heartbeat(stale, 'w1')
+    assert tasks.heartbeat(task, 'w2')
+
+
+def test_a_task_fails_after_max_attempts(tasks):
+    tasks.put('Developer', 'Pune')
+    tasks.fail(tasks.lease('w1'), 'w1')
+    tasks.fail(tasks.lease('w1'), 'w1')
+
+    assert tasks.lease('w1') is None
+    assert tasks.counts() == {'failed': 1}
+
+
+def test_a_requeued_task_keeps_its_attempts(tasks):
+    tasks.put('Developer', 'Pune')
+    tasks.requeue(tasks.lease('w1'), 'w1')
+    tasks.requeue(tasks.lease('w1'), 'w1')
+
+    assert tasks.lease('w1')['attempts'] == 0
+
+
+def test_job_claims_are_exclusive_until_released(tmp_path):
+    path = str(tmp_path / 'index.db')
+    first, second = JobIndex(path, shared=True), JobIndex(path, shared=True)
+    try:
+        assert first.claim('id:123', 'host1-1')
+        assert not second.claim('id:123', 'host2-1')
+        first.add('id:123')
+        first.release('id:123', 'host1-1')
+        # Scraped keys can never be claimed again
+        assert second.seen('id:123')
+        assert not second.claim('id:123', 'host2-1')
+
+        assert first.claim('id:456', 'host1-1')
+        first.release_owner('host1-1')
+        assert second.claim('id:456', 'host2-1')
+    finally:
+        first.close()
+        second.close()